@@ -7,17 +7,111 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QSlider,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QAbstractItemView,
     QHeaderView,
-    QMessageBox
+    QMessageBox,
+    QProgressBar,
+    QCheckBox,
+    QDialog,
+    QPlainTextEdit,
+    QFileDialog
 )
-from PyQt6.QtCore import Qt, pyqtSlot
-from backend.moda import calculate_mvp_rankings, DEFAULT_WEIGHTS, calculate_advanced_stats
-from backend.data_fetcher import fetch_player_data
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+from backend.moda import DEFAULT_WEIGHTS, prepare_scoring_dataset
+from backend.data_fetcher import fetch_player_data, refresh_player_data
+from backend.instrumentation import recording
+from backend.ranking import RankingEngine
+from backend.pareto import pareto_front
+from table_models import ArrayTableModel
+import numpy as np
 import traceback
 
+# Delay after the last slider move before live rankings are re-scored
+LIVE_DEBOUNCE_MS = 150
+
+# Number of leaders shown while live ranking
+LIVE_TOP_K = 25
+
+class PipelineCancelled(Exception):
+    """Raised from the progress callback to abort a running fetch."""
+
+class DatasetWorker(QObject):
+    """
+    Fetches player data and prepares the scoring dataset off the GUI thread.
+
+    Emits `progress` as the fetch advances, `reported` with the run's RunReport,
+    and then exactly one of `finished`, `failed` or `cancelled` when done.
+    """
+    progress = pyqtSignal(str, int, int)
+    reported = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, refresh=False):
+        super().__init__()
+        self.refresh = refresh
+        self._cancel_requested = False
+
+    def cancel(self):
+        # Checked at the next progress report from the fetch
+        self._cancel_requested = True
+
+    def report_progress(self, stage, done, total):
+        if self._cancel_requested:
+            raise PipelineCancelled()
+        self.progress.emit(stage, done, total)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            with recording() as report:
+                if self.refresh:
+                    # Only re-enrich players whose lines changed since the last snapshot
+                    player_stats = refresh_player_data(progress=self.report_progress)
+                else:
+                    player_stats = fetch_player_data(progress=self.report_progress)
+                dataset = prepare_scoring_dataset(player_stats)
+        except PipelineCancelled:
+            self.reported.emit(report)
+            self.cancelled.emit()
+        except Exception as e:
+            self.reported.emit(report)
+            self.failed.emit(f"{e}\n\n{traceback.format_exc()}")
+        else:
+            self.reported.emit(report)
+            self.finished.emit(dataset)
+
+class RunReportDialog(QDialog):
+    """Shows a RunReport as JSON, with the option to save it to a file."""
+
+    def __init__(self, report, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Run Report')
+        self.resize(600, 500)
+        self.report = report
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        text = QPlainTextEdit(report.to_json())
+        text.setReadOnly(True)
+        layout.addWidget(text)
+
+        saveButton = QPushButton('Save JSON...')
+        saveButton.clicked.connect(self.save_report)
+        layout.addWidget(saveButton)
+
+    @pyqtSlot()
+    def save_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Save Run Report', 'run_report.json', 'JSON Files (*.json)')
+        if path:
+            try:
+                self.report.to_json(path)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"An error occurred:\n{e}")
+
 class MVPApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -26,6 +120,23 @@ class MVPApp(QWidget):
         # Initialize weights (you can load from a config file if needed)
         self.weights = DEFAULT_WEIGHTS.copy()
 
+        # Prepared scoring dataset, built on first use and reused for every weight change
+        self.dataset = None
+
+        # Current scores of the dataset, updated one weight at a time as sliders move
+        self.engine = None
+
+        # Background fetch, and what to show once it finishes
+        self.worker_thread = None
+        self.worker = None
+        self.pending_action = None
+
+        # Set when the window is closed during a load; it closes once the worker stops
+        self.close_requested = False
+
+        # Instrumentation of the last data load, shown by the Run Report button
+        self.last_report = None
+
         self.initUI()
 
     def initUI(self):
@@ -38,6 +149,11 @@ class MVPApp(QWidget):
         self.showStatsButton.clicked.connect(self.show_player_stats)
         mainLayout.addWidget(self.showStatsButton)
 
+        # --- Refresh Button ---
+        self.refreshButton = QPushButton('Refresh Data')
+        self.refreshButton.clicked.connect(self.refresh_data)
+        mainLayout.addWidget(self.refreshButton)
+
         # --- Sliders ---
         slidersLayout = QHBoxLayout()
         mainLayout.addLayout(slidersLayout)
@@ -62,64 +178,243 @@ class MVPApp(QWidget):
         self.calculateButton.clicked.connect(self.calculate_mvp)
         mainLayout.addWidget(self.calculateButton)
 
+        # --- Live Ranking ---
+        self.liveCheckBox = QCheckBox('Live Ranking')
+        self.liveCheckBox.setToolTip(f'Show the top {LIVE_TOP_K} loaded players while the sliders move')
+        mainLayout.addWidget(self.liveCheckBox)
+
+        # --- Contenders Only ---
+        self.paretoCheckBox = QCheckBox('Contenders Only')
+        self.paretoCheckBox.setToolTip('Only rank players not dominated on every weighted objective by another player')
+        self.paretoCheckBox.toggled.connect(self.update_contenders)
+        mainLayout.addWidget(self.paretoCheckBox)
+
+        self.liveTimer = QTimer(self)
+        self.liveTimer.setSingleShot(True)
+        self.liveTimer.setInterval(LIVE_DEBOUNCE_MS)
+        self.liveTimer.timeout.connect(self.update_live_rankings)
+
+        # --- Progress ---
+        progressLayout = QHBoxLayout()
+        mainLayout.addLayout(progressLayout)
+
+        self.progressLabel = QLabel('')
+        self.progressBar = QProgressBar()
+        self.cancelButton = QPushButton('Cancel')
+        self.cancelButton.clicked.connect(self.cancel_loading)
+        progressLayout.addWidget(self.progressLabel)
+        progressLayout.addWidget(self.progressBar)
+        progressLayout.addWidget(self.cancelButton)
+
+        # --- Run Report Button ---
+        self.reportButton = QPushButton('Run Report')
+        self.reportButton.setToolTip('Timings, requests, cache use and dropped players of the last data load')
+        self.reportButton.clicked.connect(self.show_run_report)
+        progressLayout.addWidget(self.reportButton)
+        self.set_loading(False)
+
         # --- Table ---
-        self.tableWidget = QTableWidget()
-        self.tableWidget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)  # Make table read-only
-        self.tableWidget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch) # Make columns fill available space
-        mainLayout.addWidget(self.tableWidget)
+        # Views are backed by models reading straight from the dataset's arrays
+        self.statsModel = ArrayTableModel(parent=self)
+        self.rankingModel = ArrayTableModel(decimals={'MVP Score': 2}, parent=self)
+
+        self.tableView = QTableView()
+        self.tableView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)  # Make table read-only
+        self.tableView.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch) # Make columns fill available space
+        self.tableView.setSortingEnabled(True)
+        mainLayout.addWidget(self.tableView)
 
     @pyqtSlot(str, int, QLabel)
     def update_weight(self, name, value, label):
         self.weights[name] = value
         label.setText(f"{name}: {value}")
+        if self.engine is not None:
+            self.engine.set_weight(name, value)
+
+        # Restart the debounce timer; re-scoring happens once the slider settles
+        if self.liveCheckBox.isChecked():
+            self.liveTimer.start()
+
+    @pyqtSlot()
+    def update_live_rankings(self):
+        # Live mode only re-scores data that is already loaded, never fetches
+        if self.engine is not None and self.worker_thread is None:
+            self.populate_leaders()
+
+    @pyqtSlot()
+    def update_contenders(self):
+        # Only re-ranks data that is already loaded, never fetches
+        if self.engine is not None and self.worker_thread is None:
+            self.populate_rankings()
+
+    def set_loading(self, loading):
+        self.progressLabel.setVisible(loading)
+        self.progressBar.setVisible(loading)
+        self.cancelButton.setVisible(loading)
+        self.showStatsButton.setEnabled(not loading)
+        self.refreshButton.setEnabled(not loading)
+        self.calculateButton.setEnabled(not loading)
+        self.reportButton.setEnabled(not loading and self.last_report is not None)
+
+    def load_dataset(self, then, refresh=False):
+        """Runs `then` once the dataset is available, fetching it in the background if needed."""
+        if self.dataset is not None and not refresh:
+            then()
+            return
+
+        self.pending_action = then
+        self.worker_thread = QThread(self)
+        self.worker = DatasetWorker(refresh=refresh)
+        self.worker.moveToThread(self.worker_thread)
+
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.reported.connect(self.on_run_reported)
+        self.worker.finished.connect(self.on_dataset_loaded)
+        self.worker.failed.connect(self.on_load_failed)
+        self.worker.cancelled.connect(self.on_load_cancelled)
+        for signal in (self.worker.finished, self.worker.failed, self.worker.cancelled):
+            signal.connect(self.worker_thread.quit)
+        self.worker_thread.finished.connect(self.on_worker_stopped)
+
+        self.progressLabel.setText('Loading player data...')
+        self.progressBar.setRange(0, 0)  # Busy until the first progress report
+        self.set_loading(True)
+        self.worker_thread.start()
+
+    @pyqtSlot()
+    def cancel_loading(self):
+        if self.worker is not None:
+            self.progressLabel.setText('Cancelling...')
+            self.worker.cancel()
+
+    @pyqtSlot(str, int, int)
+    def on_progress(self, stage, done, total):
+        self.progressLabel.setText(f"{stage} ({done}/{total})")
+        self.progressBar.setRange(0, total)
+        self.progressBar.setValue(done)
+
+    @pyqtSlot(object)
+    def on_run_reported(self, report):
+        self.last_report = report
+
+    @pyqtSlot()
+    def show_run_report(self):
+        if self.last_report is not None:
+            RunReportDialog(self.last_report, self).exec()
+
+    @pyqtSlot(object)
+    def on_dataset_loaded(self, dataset):
+        if self.close_requested:
+            return
+        self.dataset = dataset
+        self.engine = RankingEngine(dataset, self.weights)
+        action, self.pending_action = self.pending_action, None
+        if action is not None:
+            action()
+
+    @pyqtSlot(str)
+    def on_load_failed(self, message):
+        self.pending_action = None
+        if self.close_requested:
+            return
+        QMessageBox.critical(self, "Error", f"An error occurred:\n{message}")
+
+    @pyqtSlot()
+    def on_load_cancelled(self):
+        self.pending_action = None
+
+    @pyqtSlot()
+    def on_worker_stopped(self):
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker_thread = None
+        self.worker = None
+        self.set_loading(False)
+        if self.close_requested:
+            self.close()
+
+    def closeEvent(self, event):
+        # The worker thread must not be destroyed mid-run (e.g. in a snapshot or
+        # checkpoint write): cancel the load and close once the worker has stopped
+        if self.worker_thread is not None:
+            self.close_requested = True
+            self.pending_action = None
+            self.progressLabel.setText('Closing...')
+            self.worker.cancel()
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    @pyqtSlot()
+    def refresh_data(self):
+        # Re-fetch the league dashboards and update the snapshot incrementally
+        self.load_dataset(
+            lambda: QMessageBox.information(self, "Refresh", "Player data refreshed."),
+            refresh=True
+        )
 
     @pyqtSlot()
     def show_player_stats(self):
+        self.load_dataset(self.populate_player_stats)
+
+    @pyqtSlot()
+    def calculate_mvp(self):
+        self.load_dataset(self.populate_rankings)
+
+    def show_model(self, model, sort_column=None, sort_order=Qt.SortOrder.AscendingOrder):
+        # Switching views keeps each model's data and sort; only the first show sets the sort
+        if self.tableView.model() is not model:
+            self.tableView.setModel(model)
+            if sort_column is not None:
+                self.tableView.sortByColumn(sort_column, sort_order)
+
+    def populate_player_stats(self):
         try:
-            # Fetch player data and calculate advanced stats
-            player_stats = fetch_player_data()
-            df = calculate_advanced_stats(player_stats)
+            # Advanced stats are kept on the prepared dataset
+            df = self.dataset.stats
 
             # Filter columns
             columns_to_keep = list(DEFAULT_WEIGHTS.keys())
             if 'name' in df.columns:
                 columns_to_keep.append('name')
-            try:
-                df = df[columns_to_keep]
-            except KeyError as e:
-                print(f"Warning: One or more columns from DEFAULT_WEIGHTS not found in DataFrame: {e}")
-                existing_columns = [col for col in columns_to_keep if col in df.columns]
-                df = df[existing_columns]
-
-            # Set up the table
-            self.tableWidget.clear()
-            self.tableWidget.setRowCount(df.shape[0])
-            self.tableWidget.setColumnCount(df.shape[1])
-            self.tableWidget.setHorizontalHeaderLabels(df.columns.tolist())
-
-            # Populate the table
-            for i in range(df.shape[0]):
-                for j in range(df.shape[1]):
-                    item = QTableWidgetItem(str(df.iloc[i, j]))
-                    self.tableWidget.setItem(i, j, item)
+            existing_columns = [col for col in columns_to_keep if col in df.columns]
+            if len(existing_columns) < len(columns_to_keep):
+                print(f"Warning: One or more columns from DEFAULT_WEIGHTS not found in DataFrame: {set(columns_to_keep) - set(existing_columns)}")
+
+            self.statsModel.set_columns({col: df[col].to_numpy() for col in existing_columns})
+            self.show_model(self.statsModel)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred:\n{e}\n\n{traceback.format_exc()}")
 
-    @pyqtSlot()
-    def calculate_mvp(self):
+    def populate_rankings(self):
         try:
-            mvp_rankings = calculate_mvp_rankings(self.weights)
+            self.engine.set_weights(self.weights)
+            scores = self.engine.scores.copy()
+
+            # Dominated players can never rank first under the active objectives; ranks stay league-wide
+            rows = slice(None)
+            if self.paretoCheckBox.isChecked():
+                rows = pareto_front(self.dataset, self.weights)
 
-            self.tableWidget.clear()
-            self.tableWidget.setRowCount(len(mvp_rankings))
-            self.tableWidget.setColumnCount(3)
-            self.tableWidget.setHorizontalHeaderLabels(['Rank', 'Player', 'MVP Score'])
+            # Same players as last time, so this refreshes the cells in place
+            self.rankingModel.set_columns({
+                'Rank': self.engine.ranks()[rows], 'Player': self.dataset.names[rows], 'MVP Score': scores[rows]
+            })
+            self.show_model(self.rankingModel, sort_column=0)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred:\n{e}\n\n{traceback.format_exc()}")
+
+    def populate_leaders(self):
+        try:
+            # Only the leaders are selected and sorted, not the whole league
+            order, scores = self.engine.top_k(LIVE_TOP_K)
 
-            for i, player_data in enumerate(mvp_rankings):
-                self.tableWidget.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-                self.tableWidget.setItem(i, 1, QTableWidgetItem(player_data['name']))
-                self.tableWidget.setItem(i, 2, QTableWidgetItem(str(round(player_data['MVP Score'], 2))))
+            self.rankingModel.set_columns({
+                'Rank': np.arange(1, len(order) + 1), 'Player': self.dataset.names[order], 'MVP Score': scores
+            })
+            self.show_model(self.rankingModel, sort_column=0)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred:\n{e}\n\n{traceback.format_exc()}")
 
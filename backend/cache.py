@@ -0,0 +1,245 @@
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from .config import get_cache_dir, get_snapshot_ttl_hours
+from .instrumentation import record_cache_lookup
+from .store import PlayerStore
+
+def snapshot_path(season):
+    """
+    Returns the path of the on-disk snapshot for a season.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        str: Path to the season's Parquet snapshot file.
+    """
+    return os.path.join(get_cache_dir(), f"player_stats_{season}.parquet")
+
+def snapshot_age_hours(season):
+    """
+    Returns how long ago the snapshot for a season was written.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        float: Age of the snapshot in hours, or None if no snapshot exists.
+    """
+    path = snapshot_path(season)
+    if not os.path.exists(path):
+        return None
+    return (time.time() - os.path.getmtime(path)) / 3600
+
+def is_snapshot_fresh(season, ttl_hours=None):
+    """
+    Checks whether a season snapshot exists and is younger than the TTL.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        ttl_hours (float): Maximum snapshot age in hours. Defaults to the configured TTL.
+
+    Returns:
+        bool: True if the snapshot can be used without going to the network.
+    """
+    if ttl_hours is None:
+        ttl_hours = get_snapshot_ttl_hours()
+
+    age = snapshot_age_hours(season)
+    return age is not None and age <= ttl_hours
+
+def load_snapshot(season, ttl_hours=None):
+    """
+    Loads the merged per-player stats for a season from disk.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        ttl_hours (float): Maximum snapshot age in hours. Defaults to the configured TTL.
+                           Pass float('inf') to accept a snapshot of any age.
+
+    Returns:
+        PlayerStore: The season's players, or None if the snapshot is missing, stale or unreadable.
+    """
+    if not is_snapshot_fresh(season, ttl_hours):
+        record_cache_lookup('snapshot', hit=False)
+        return None
+
+    try:
+        df = pd.read_parquet(snapshot_path(season))
+    except Exception as e:
+        print(f"Warning: Could not read snapshot for {season}: {e}")
+        record_cache_lookup('snapshot', hit=False)
+        return None
+
+    record_cache_lookup('snapshot', hit=True)
+    return PlayerStore.from_frame(df)
+
+def save_snapshot(season, player_stats):
+    """
+    Writes the merged per-player stats for a season to disk.
+
+    The file is written to a temporary path first and then moved into place,
+    so an interrupted write never leaves a truncated snapshot behind.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        player_stats (PlayerStore or dict): The season's players, as a store or as a dictionary
+                                            where keys are player names and values are dictionaries of stats.
+
+    Returns:
+        str: Path to the written snapshot, or None if there was nothing to save.
+    """
+    if not player_stats:
+        return None
+
+    if isinstance(player_stats, dict):
+        player_stats = PlayerStore.from_records(player_stats)
+    df = player_stats.to_frame().set_index('name')
+
+    path = snapshot_path(season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+    return path
+
+def clear_snapshot(season):
+    """
+    Deletes the snapshot for a season, forcing the next fetch to hit the network.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+    """
+    path = snapshot_path(season)
+    if os.path.exists(path):
+        os.remove(path)
+
+def league_context_path(season):
+    """
+    Returns the path of the on-disk league context for a season.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        str: Path to the season's league context JSON file.
+    """
+    return os.path.join(get_cache_dir(), f"league_{season}.json")
+
+def load_league_context(season):
+    """
+    Loads the league-wide constants (eFG%, ...) stored for a season.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        dict: The stored league context, or None if missing or unreadable.
+    """
+    path = league_context_path(season)
+    if not os.path.exists(path):
+        record_cache_lookup('league_context', hit=False)
+        return None
+
+    try:
+        with open(path) as f:
+            context = json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read league context for {season}: {e}")
+        record_cache_lookup('league_context', hit=False)
+        return None
+
+    record_cache_lookup('league_context', hit=True)
+    return context
+
+def save_league_context(season, context):
+    """
+    Writes the league-wide constants for a season next to its snapshot.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        context (dict): League constants, e.g. {'efg': 0.54}.
+
+    Returns:
+        str: Path to the written file.
+    """
+    path = league_context_path(season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(context, f)
+    os.replace(tmp_path, path)
+
+    return path
+
+def frame_path(name):
+    """
+    Returns the path of a cached league-wide frame.
+
+    Args:
+        name (str): Name of the frame (e.g., 'combine').
+
+    Returns:
+        str: Path to the frame's Parquet file.
+    """
+    return os.path.join(get_cache_dir(), f"frame_{name}.parquet")
+
+def load_frame(name, ttl_hours):
+    """
+    Loads a cached league-wide frame if it is younger than the TTL.
+
+    Args:
+        name (str): Name of the frame (e.g., 'combine').
+        ttl_hours (float): Maximum age in hours.
+
+    Returns:
+        pd.DataFrame: The cached frame, or None if missing, stale or unreadable.
+    """
+    path = frame_path(name)
+    if not os.path.exists(path) or (time.time() - os.path.getmtime(path)) / 3600 > ttl_hours:
+        record_cache_lookup(f"frame_{name}", hit=False)
+        return None
+
+    try:
+        df = pd.read_parquet(path)
+    except Exception as e:
+        print(f"Warning: Could not read cached {name} frame: {e}")
+        record_cache_lookup(f"frame_{name}", hit=False)
+        return None
+
+    record_cache_lookup(f"frame_{name}", hit=True)
+    return df
+
+def save_frame(name, df):
+    """
+    Caches a league-wide frame on disk.
+
+    Frames that cannot be stored as Parquet are reported and skipped; the
+    cache is only an optimization.
+
+    Args:
+        name (str): Name of the frame (e.g., 'combine').
+        df (pd.DataFrame): The frame to cache.
+
+    Returns:
+        str: Path to the written file, or None if it could not be written.
+    """
+    path = frame_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A temporary file of its own, since season workers in other processes may cache the same frame
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: Could not cache {name} frame: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+    return path
@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager, nullcontext
+from .config import get_cache_dir
+
+# --- Enrichment Checkpoints ---
+# Checkpoints older than this are discarded instead of resumed, so a run never
+# picks up defensive stats from a much older pass
+CHECKPOINT_TTL_HOURS = 24
+
+# Player states in the checkpoint
+DONE = 'done'      # Fully enriched
+FAILED = 'failed'  # Last attempt failed; retried on the next pass
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL,
+    line TEXT,
+    name TEXT,
+    dbpm,
+    dws,
+    stage TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+"""
+
+def checkpoint_path(season):
+    """
+    Returns the path of the enrichment checkpoint for a season.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        str: Path to the season's SQLite checkpoint file.
+    """
+    return os.path.join(get_cache_dir(), f"enrichment_{season}.sqlite")
+
+def clear_checkpoint(season):
+    """
+    Deletes the enrichment checkpoint for a season, so the next run starts over.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+    """
+    path = checkpoint_path(season)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+class EnrichmentCheckpoint:
+    """
+    Durable per-player progress of an enrichment run.
+
+    Every player is committed to a SQLite file as soon as its defensive stats
+    arrive, so an interrupted run resumes where it stopped: enriched players are
+    not fetched again, and failed players are retried.
+
+    Each player is stored with its line (games and minutes played, see
+    data_fetcher.DIFF_COLUMNS) and only reused while the line is unchanged, so a
+    later refresh never picks up stats fetched before the player's line moved.
+    """
+
+    def __init__(self, season, ttl_hours=CHECKPOINT_TTL_HOURS):
+        self.season = season
+        self.path = checkpoint_path(season)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._connection = self._open()
+        self._batched = False
+        created_at = self._connection.execute("SELECT value FROM meta WHERE key = 'created_at'").fetchone()
+        if created_at is not None and (time.time() - created_at[0]) / 3600 > ttl_hours:
+            print(f"Warning: Discarding enrichment checkpoint for {season} older than {ttl_hours} hours.")
+            self._connection.close()
+            clear_checkpoint(season)
+            self._connection = self._open()
+            created_at = None
+
+        if created_at is None:
+            with self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('created_at', ?)", (time.time(),))
+
+    def _open(self):
+        connection = sqlite3.connect(self.path)
+        # Write-ahead logging: a commit per player appends to the log without a full sync
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the checkpoint, keeping it on disk for the next run."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def discard(self):
+        """Closes and deletes the checkpoint once a run has nothing left to retry."""
+        self.close()
+        clear_checkpoint(self.season)
+
+    @contextmanager
+    def batch(self):
+        """Groups the writes made inside the block into one transaction."""
+        with self._connection:
+            self._batched = True
+            try:
+                yield self
+            finally:
+                self._batched = False
+
+    def completed(self, lines):
+        """
+        Returns the fully enriched players whose line is unchanged.
+
+        Args:
+            lines (dict): PLAYER_ID -> current line of every player to look up.
+
+        Returns:
+            dict: PLAYER_ID -> {'name', 'DBPM', 'DWS'}, as returned by enrich_players.
+        """
+        rows = self._connection.execute("SELECT player_id, line, name, dbpm, dws FROM players WHERE state = ?", (DONE,))
+        return {
+            player_id: {'name': name, 'DBPM': dbpm, 'DWS': dws}
+            for player_id, line, name, dbpm, dws in rows
+            if lines.get(player_id) == line
+        }
+
+    def failed(self):
+        """
+        Returns the players whose last attempt failed.
+
+        Returns:
+            dict: PLAYER_ID -> {'name', 'stage', 'error', 'attempts'}.
+        """
+        rows = self._connection.execute(
+            "SELECT player_id, name, stage, error, attempts FROM players WHERE state = ?", (FAILED,)
+        )
+        return {
+            player_id: {'name': name, 'stage': stage, 'error': error, 'attempts': attempts}
+            for player_id, name, stage, error, attempts in rows
+        }
+
+    def mark_done(self, player_id, line, name, dbpm, dws):
+        """Records a fully enriched player."""
+        self._write(player_id, DONE, line, name=name, dbpm=dbpm, dws=dws)
+
+    def mark_failed(self, player_id, line, stage, error, name=None):
+        """
+        Records a failed attempt for a player.
+
+        Args:
+            player_id (int): The player's PLAYER_ID.
+            line (str): The player's current line.
+            stage (str): Stage the attempt failed in (e.g., 'Defensive stats').
+            error: The exception or message.
+            name (str): The player's display name, if already known.
+        """
+        self._write(player_id, FAILED, line, name=name, stage=stage, error=str(error), attempt=True)
+
+    def _write(self, player_id, state, line, name=None, dbpm=None, dws=None, stage=None, error=None, attempt=False):
+        # One transaction per player unless batched
+        with nullcontext() if self._batched else self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO players (player_id, state, line, name, dbpm, dws, stage, error, attempts, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (player_id) DO UPDATE SET
+                    state = excluded.state,
+                    line = excluded.line,
+                    name = excluded.name,
+                    dbpm = excluded.dbpm,
+                    dws = excluded.dws,
+                    stage = excluded.stage,
+                    error = excluded.error,
+                    attempts = players.attempts + excluded.attempts,
+                    updated_at = excluded.updated_at
+                """,
+                (int(player_id), state, line, name, dbpm, dws, stage, error, int(attempt), time.time())
+            )
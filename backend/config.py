@@ -1,10 +1,38 @@
-
 # config.py
+import os
+
 LEAGUE_EFG = None  # Initialize with a default value
 
+# --- Season ---
+CURRENT_SEASON = '2024-25'
+
+# --- Snapshot Cache ---
+# Directory holding the on-disk season snapshots (override with NBA_MODA_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    'NBA_MODA_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache')
+)
+
+# Snapshots older than this are considered stale and re-fetched
+SNAPSHOT_TTL_HOURS = 12
+
 def set_league_efg(efg):
     global LEAGUE_EFG
     LEAGUE_EFG = efg
 
 def get_league_efg():
-    return LEAGUE_EFG
\ No newline at end of file
+    return LEAGUE_EFG
+
+def set_cache_dir(path):
+    global CACHE_DIR
+    CACHE_DIR = path
+
+def get_cache_dir():
+    return CACHE_DIR
+
+def set_snapshot_ttl_hours(hours):
+    global SNAPSHOT_TTL_HOURS
+    SNAPSHOT_TTL_HOURS = hours
+
+def get_snapshot_ttl_hours():
+    return SNAPSHOT_TTL_HOURS
@@ -1,39 +1,111 @@
 from nba_api.stats.static import players
-from nba_api.stats.endpoints import commonplayerinfo, leaguedashplayerstats, leaguedashplayerclutch, leaguedashplayerbiostats, draftcombinestats, leaguedashteamstats
-import requests
+from nba_api.stats.endpoints import leaguedashplayerstats, leaguedashplayerclutch, leaguedashplayerbiostats, draftcombinestats, leaguedashteamstats
 from bs4 import BeautifulSoup
+import re
+import threading
 import time
+import unicodedata
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from .config import get_league_efg, set_league_efg
+from .config import CURRENT_SEASON
+from .league import set_league_context
+from .cache import load_snapshot, save_snapshot, load_frame, save_frame
+from .checkpoint import EnrichmentCheckpoint
+from .player_index import PlayerIndex
+from .store import PlayerStore, STAT_COLUMNS, UNKNOWN_PLAYER_ID
+from .instrumentation import stage, record_request, record_dropped_player
+from .scraper import (
+    BBREF_BASE_URL, BBREF_REQUESTS_PER_MINUTE, MAX_WORKERS, RateLimiter, create_session, get_with_retry, scrape_concurrently
+)
 
-def get_advanced_defensive_stats(player_name, season):
+# --- League Endpoints ---
+# Every league-wide NBA API request, keyed by name; called as endpoint(season, timeout)
+LEAGUE_ENDPOINTS = {
+    'general': lambda season, timeout: leaguedashplayerstats.LeagueDashPlayerStats(season=season, rank='N', timeout=timeout),
+    'per100': lambda season, timeout: leaguedashplayerstats.LeagueDashPlayerStats(season=season, rank='N', per_mode_detailed='Per100Possessions', timeout=timeout),
+    'bio': lambda season, timeout: leaguedashplayerbiostats.LeagueDashPlayerBioStats(season=season, timeout=timeout),
+    'clutch': lambda season, timeout: leaguedashplayerclutch.LeagueDashPlayerClutch(season=season, rank='N', timeout=timeout),
+    'combine': lambda season, timeout: draftcombinestats.DraftCombineStats(season_all_time='All Time', timeout=timeout),
+    'team': lambda season, timeout: leaguedashteamstats.LeagueDashTeamStats(season=season, measure_type_detailed_defense='Advanced', timeout=timeout)
+}
+
+# League context key -> advanced team stats column averaged across the league
+LEAGUE_CONTEXT_COLUMNS = {'ts': 'TS_PCT', 'pace': 'PACE'}
+
+# Endpoints whose data does not change within a season, cached on disk
+STATIC_LEAGUE_ENDPOINTS = {'combine'}
+STATIC_FRAME_TTL_HOURS = 24 * 30
+
+# Endpoints the pipeline can run without
+OPTIONAL_LEAGUE_ENDPOINTS = {'team'}
+
+# Shared limit on concurrent NBA API requests across all callers
+NBA_API_MAX_CONCURRENCY = 6
+NBA_API_SEMAPHORE = threading.BoundedSemaphore(NBA_API_MAX_CONCURRENCY)
+NBA_API_TIMEOUT = 30
+
+# Host the NBA API statistics are reported under in run reports
+NBA_API_HOST = 'stats.nba.com'
+
+# --- Player Table Schema ---
+# Minimum MIN (as reported by LeagueDashPlayerStats) for a player to qualify
+MIN_MINUTES = 25
+
+# League-wide source column -> stat name, per frame joined on PLAYER_ID
+GENERAL_COLUMNS = {
+    'PTS': 'PTS', 'AST': 'AST', 'TOV': 'TOV', 'FG3A': '3PA', 'FG3_PCT': '3P%', 'GP': 'GP', 'MIN': 'MP',
+    'FGM': 'FG', 'FGA': 'FGA', 'FTA': 'FTA', 'FT_PCT': 'FT%', 'PLUS_MINUS': '+/-'
+}
+PER100_COLUMNS = {'FG3A': '3PAper100'}
+BIO_COLUMNS = {
+    'PLAYER_HEIGHT_INCHES': 'Height', 'PLAYER_WEIGHT': 'Weight', 'TS_PCT': 'TS%',
+    'USG_PCT': 'Usage%', 'OREB_PCT': 'ORB%', 'DREB_PCT': 'DRB%', 'AST_PCT': 'pAST%'
+}
+CLUTCH_COLUMNS = {'PTS': 'Clutch_PTS', 'FGA': 'Clutch_FGA', 'FTA': 'Clutch_FTA', 'PLUS_MINUS': 'Clutch_+/-'}
+COMBINE_COLUMNS = {'MAX_VERTICAL_LEAP': 'Max_Vertical_Leap', 'WINGSPAN': 'Wingspan'}
+
+# Value used when a player has no row in a joined frame (0 unless listed here)
+COLUMN_DEFAULTS = {}
+
+# Columns compared against the last snapshot to detect changed players
+DIFF_COLUMNS = ['GP', 'MP']
+
+# Generational suffixes ignored when matching names across sites
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+def get_advanced_defensive_stats(player_name, season, session=None, rate_limiter=None, base_url=None, slug=None):
     """
     Web scrapes Basketball Reference for a given player and season to retrieve DWS and DBPM.
     
     Parameters:
         player_name (str): The name of the player (e.g., "LeBron James").
         season (str): The season year in the format "YYYY-YY" (e.g., "2023-24").
+        session (requests.Session): Optional pooled session to reuse. A new one is created if not given.
+        rate_limiter (RateLimiter): Optional limiter shared with other concurrent scrapes.
+        base_url (str): Basketball Reference root URL. Defaults to BBREF_BASE_URL.
+        slug (str): The player's Basketball Reference ID (e.g., "jamesle01"), see
+                    backend.player_index. Guessed from the name if not given.
     
     Returns:
         dict: A dictionary containing the player's DWS and DBPM for the specified season.
     """
-    # Split the string into the start year and the last two digits of the end year
-    start_year, end_short = season.split('-')
-    
-    # Extract the first two digits of the start year
-    century = start_year[:2]
-    
-    # Combine the century with the last two digits to form the full end year
-    season = int(century + end_short)
+    # Basketball Reference identifies seasons by the year they end in
+    season = season_end_year(season)
 
-    # Split the player name into first and last name
-    first_name, last_name = player_name.lower().split()
+    if slug is None:
+        slug = guess_bbref_slug(player_name)
     
     # Construct the player's URL
-    player_url = f"https://www.basketball-reference.com/players/{last_name[0]}/{last_name[:5]}{first_name[:2]}01.html"
+    if base_url is None:
+        base_url = BBREF_BASE_URL
+    player_url = f"{base_url}/players/{slug[0]}/{slug}.html"
     
-    # Send a GET request to the player's page
-    response = requests.get(player_url)
+    # Send a GET request to the player's page, retrying on 429/5xx
+    if session is None:
+        session = create_session(pool_size=1)
+    response = get_with_retry(session, player_url, rate_limiter)
     
     # Check if the request was successful
     if response.status_code != 200:
@@ -78,106 +150,574 @@ def get_advanced_defensive_stats(player_name, season):
         "DBPM": dbpm
     }
 
-def fetch_player_data():
+def season_end_year(season):
     """
-    Fetches player data from the NBA API for the 2023-24 season.
-    Filters for players who averaged at least 20 minutes per game.
+    Converts a season string to the year it ends in, as used by Basketball Reference.
+
+    Args:
+        season (str): The season year in the format "YYYY-YY" (e.g., "2023-24").
 
     Returns:
-        dict: A dictionary where keys are player names and values are dictionaries of stats.
+        int: The end year of the season (e.g., 2024).
     """
-    all_player_stats = {}
+    start_year, end_short = season.split('-')
+    return int(start_year[:2] + end_short)
+
+def guess_bbref_slug(player_name):
+    """
+    Guesses a player's Basketball Reference ID from the name.
+
+    Follows the site's scheme: the first five letters of the last name and the
+    first two of the first name, with the number 01. Later players with the same
+    letters get 02, 03, ..., so the guess can point at the wrong player; only used
+    for players missing from backend.player_index.
 
-    # Hardcode the current season
-    current_season = '2024-25'
+    Args:
+        player_name (str): Player name (e.g., "Karl-Anthony Towns").
 
-    # Fetch general stats to filter players by MPG
-    general_stats = leaguedashplayerstats.LeagueDashPlayerStats(season=current_season, rank='N')
-    general_stats_df = general_stats.get_data_frames()[0]
+    Returns:
+        str: The guessed ID (e.g., "townska01").
 
-    # Create player_dict with players having MPG >= 25
-    player_dict = [
-        {'id': row['PLAYER_ID'], 'full_name': row['PLAYER_NAME']}
-        for index, row in general_stats_df.iterrows()
-        if row['MIN'] >= 25
-    ]
+    Raises:
+        ValueError: If the name has no first and last name.
+    """
+    name = unicodedata.normalize('NFKD', player_name).encode('ascii', 'ignore').decode('ascii')
+    parts = [part for part in re.sub(r"[^a-z ]", '', name.lower()).split() if part not in NAME_SUFFIXES]
+    if len(parts) < 2:
+        raise ValueError(f"Cannot derive a Basketball Reference ID from '{player_name}'.")
 
-    general_stats_per100 = leaguedashplayerstats.LeagueDashPlayerStats(season=current_season, rank='N', per_mode_detailed='Per100Possessions')
-    general_stats__per100_df = general_stats_per100.get_data_frames()[0]
+    first_name, last_name = parts[0], ''.join(parts[1:])
+    return f"{last_name[:5]}{first_name[:2]}01"
 
-    advanced_stats = leaguedashplayerbiostats.LeagueDashPlayerBioStats(season=current_season)
-    advanced_stats_df = advanced_stats.get_data_frames()[0]
+def normalize_player_name(name):
+    """
+    Normalizes a player name for matching across data sources.
 
-    clutch_stats = leaguedashplayerclutch.LeagueDashPlayerClutch(season=current_season, rank='N')
-    clutch_stats_df = clutch_stats.get_data_frames()[0]
+    Strips accents and punctuation, lowercases, and drops generational suffixes,
+    so "Luka Dončić", "Jaren Jackson Jr." and "Jaren Jackson" compare equal to
+    their counterparts on the other site.
 
-    combine_stats = draftcombinestats.DraftCombineStats(season_all_time='All Time')
-    combine_stats_df = combine_stats.get_data_frames()[0]
+    Args:
+        name (str): Player name as displayed by the NBA API or Basketball Reference.
 
-    for player in player_dict:
-        try:
-            # Basic info
-            player_info = commonplayerinfo.CommonPlayerInfo(player_id=player['id']).get_data_frames()[0]
-            name = player_info['DISPLAY_FIRST_LAST'][0]
-            time.sleep(0.6)  # Avoid rate limiting
-
-            # General stats
-            general_stats_df_player = general_stats_df[general_stats_df['PLAYER_ID'] == player['id']]
-
-            # General stats per 100 possessions
-            general_stats__per100_df_player = general_stats__per100_df[general_stats__per100_df['PLAYER_ID'] == player['id']]
-
-            # Advanced stats
-            advanced_stats_df_player = advanced_stats_df[advanced_stats_df['PLAYER_ID'] == player['id']]
-
-            # Clutch stats
-            clutch_stats_df_player = clutch_stats_df[clutch_stats_df['PLAYER_ID'] == player['id']]
-
-            # Combine stats
-            combine_stats_df_player = combine_stats_df[combine_stats_df['PLAYER_ID'] == player['id']]
-
-            # Defense stats
-            defense_stats = get_advanced_defensive_stats(name, current_season)
-
-            # Combine stats
-            player_stats = {
-                'Height': advanced_stats_df_player['PLAYER_HEIGHT_INCHES'].iloc[0],
-                'Weight': advanced_stats_df_player['PLAYER_WEIGHT'].iloc[0],
-                'PTS': general_stats_df_player['PTS'].iloc[0] if not general_stats_df_player.empty else 0,
-                'AST': general_stats_df_player['AST'].iloc[0] if not general_stats_df_player.empty else 0,
-                'TOV': general_stats_df_player['TOV'].iloc[0] if not general_stats_df_player.empty else 0,
-                '3PA': general_stats_df_player['FG3A'].iloc[0] if not general_stats_df_player.empty else 0,
-                '3PAper100': general_stats__per100_df_player['FG3A'].iloc[0] if not general_stats__per100_df_player.empty else 0,
-                '3P%': general_stats_df_player['FG3_PCT'].iloc[0] if not general_stats_df_player.empty else 0,
-                'GP': general_stats_df_player['GP'].iloc[0] if not general_stats_df_player.empty else 0,
-                'MP': general_stats_df_player['MIN'].iloc[0] if not general_stats_df_player.empty else 0,
-                'TmMP': general_stats_df_player['GP'].iloc[0] * 48 if not general_stats_df_player.empty else 0, # Assuming 48 minutes per game
-                'FG': general_stats_df_player['FGM'].iloc[0] if not general_stats_df_player.empty else 0,
-                'FGA': general_stats_df_player['FGA'].iloc[0] if not general_stats_df_player.empty else 0,
-                'FTA': general_stats_df_player['FTA'].iloc[0] if not general_stats_df_player.empty else 0,
-                'TS%': advanced_stats_df_player['TS_PCT'].iloc[0] if not advanced_stats_df_player.empty else 0,
-                'FT%': general_stats_df_player['FT_PCT'].iloc[0] if not general_stats_df_player.empty else 0,
-                '+/-': general_stats_df_player['PLUS_MINUS'].iloc[0] if not general_stats_df_player.empty else 0,
-                'Clutch_PTS': clutch_stats_df_player['PTS'].iloc[0] if not clutch_stats_df_player.empty else 0,
-                'Clutch_FGA': clutch_stats_df_player['FGA'].iloc[0] if not clutch_stats_df_player.empty else 0,
-                'Clutch_FTA': clutch_stats_df_player['FTA'].iloc[0] if not clutch_stats_df_player.empty else 0,
-                'Clutch_+/-': clutch_stats_df_player['PLUS_MINUS'].iloc[0] if not clutch_stats_df_player.empty else 0,
-                'Max_Vertical_Leap': combine_stats_df_player['MAX_VERTICAL_LEAP'].iloc[0] if not combine_stats_df_player.empty else 0,
-                'Wingspan': combine_stats_df_player['WINGSPAN'].iloc[0] if not combine_stats_df_player.empty else 0,
-                'Usage%': advanced_stats_df_player['USG_PCT'].iloc[0] if not advanced_stats_df_player.empty else 0,
-                'ORB%': advanced_stats_df_player['OREB_PCT'].iloc[0] if not advanced_stats_df_player.empty else 0,
-                'DRB%': advanced_stats_df_player['DREB_PCT'].iloc[0] if not advanced_stats_df_player.empty else 0,
-                'pAST%': advanced_stats_df_player['AST_PCT'].iloc[0] if not advanced_stats_df_player.empty else 0,
-                'DBPM': defense_stats['DBPM'], 
-                'DWS': defense_stats['DWS']
-            }
-
-            all_player_stats[name] = player_stats
-
-        except Exception as e:
-            print(f"Error fetching data for {player['full_name']}: {e}")
-
-    return all_player_stats
+    Returns:
+        str: The normalized name.
+    """
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    name = re.sub(r"[^a-z ]", '', name.lower().replace('-', ' '))
+    parts = [part for part in name.split() if part not in NAME_SUFFIXES]
+    return ' '.join(parts)
+
+def parse_league_advanced_table(html):
+    """
+    Parses the season-wide Advanced table from a Basketball Reference league page.
+
+    Players who changed teams appear once per team plus a combined row listed
+    first; only that first (season total) row is kept.
+
+    Args:
+        html (str or bytes): Content of the league advanced stats page.
+
+    Returns:
+        pd.DataFrame: One row per player with columns 'slug', 'Player', 'DWS' and 'DBPM'.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    advanced_table = soup.find("table", {"id": "advanced"}) or soup.find("table", {"id": "advanced_stats"})
+    if not advanced_table:
+        raise Exception("Advanced stats table not found on the league page.")
+
+    rows = []
+    seen = set()
+    for row in advanced_table.find("tbody").find_all("tr"):
+        # Skip the header rows repeated inside the body
+        if 'thead' in (row.get('class') or []):
+            continue
+
+        player_cell = row.find(attrs={"data-stat": ["name_display", "player"]})
+        if player_cell is None:
+            continue
+
+        # The player's page link carries the Basketball Reference ID (e.g. /players/j/jamesle01.html)
+        link = player_cell.find("a")
+        slug = player_cell.get("data-append-csv")
+        if link is not None and link.get("href"):
+            slug = link["href"].rsplit('/', 1)[-1].split('.')[0]
+        if not slug or slug in seen:
+            continue
+        seen.add(slug)
+
+        dws = row.find(attrs={"data-stat": "dws"})
+        dbpm = row.find(attrs={"data-stat": "dbpm"})
+        rows.append({
+            'slug': slug,
+            'Player': player_cell.text.strip().rstrip('*'),
+            'DWS': dws.text if dws is not None else '',
+            'DBPM': dbpm.text if dbpm is not None else ''
+        })
+
+    return pd.DataFrame(rows, columns=['slug', 'Player', 'DWS', 'DBPM'])
+
+def match_players_to_bbref(player_names, bbref_df, known_slugs=None):
+    """
+    Reconciles Basketball Reference rows to NBA API players.
+
+    Players whose Basketball Reference ID is already known are matched on it;
+    the rest by normalized name. Names that map to more than one Basketball
+    Reference player are left unmatched rather than guessed; their PLAYER_IDs
+    are listed in the result's attrs['ambiguous'].
+
+    Args:
+        player_names (pd.Series): NBA API player names indexed by PLAYER_ID.
+        bbref_df (pd.DataFrame): Parsed league table from parse_league_advanced_table.
+        known_slugs (dict): Optional PLAYER_ID -> slug (see backend.player_index).
+
+    Returns:
+        pd.DataFrame: Matched rows indexed by PLAYER_ID with columns 'slug', 'Player', 'DWS' and 'DBPM'.
+    """
+    by_slug = bbref_df.iloc[:0]
+    if known_slugs:
+        known = pd.Series(known_slugs, dtype=object)
+        known = known[known.isin(bbref_df['slug'])]
+        by_slug = bbref_df.set_index('slug', drop=False).loc[known.to_numpy()]
+        by_slug.index = known.index
+
+        # Only the remaining players and rows are matched by name
+        player_names = player_names[~player_names.index.isin(known.index)]
+        bbref_df = bbref_df[~bbref_df['slug'].isin(known)]
+
+    keys = bbref_df['Player'].map(normalize_player_name)
+    repeated = keys.duplicated(keep=False)
+    unique = bbref_df[~repeated].set_index(keys[~repeated])
+
+    normalized = player_names.map(normalize_player_name)
+    matched = normalized[normalized.isin(unique.index)]
+
+    by_name = unique.loc[matched.to_numpy()]
+    by_name.index = matched.index
+
+    result = pd.concat([by_slug, by_name]) if len(by_slug) else by_name
+    result.index.name = 'PLAYER_ID'
+    result.attrs['ambiguous'] = list(normalized.index[normalized.isin(keys[repeated])])
+    return result
+
+def fetch_league_defensive_stats(player_names, season, session=None, base_url=None, known_slugs=None):
+    """
+    Fetches DWS and DBPM for every player in one request to the season-wide advanced table.
+
+    Args:
+        player_names (pd.Series): NBA API player names indexed by PLAYER_ID.
+        season (str): The season year in the format "YYYY-YY" (e.g., "2023-24").
+        session (requests.Session): Optional pooled session to reuse.
+        base_url (str): Basketball Reference root URL. Defaults to BBREF_BASE_URL.
+        known_slugs (dict): Optional PLAYER_ID -> slug, see match_players_to_bbref.
+
+    Returns:
+        pd.DataFrame: Defensive stats (and 'slug') indexed by PLAYER_ID for every player that could be matched.
+    """
+    if base_url is None:
+        base_url = BBREF_BASE_URL
+    league_url = f"{base_url}/leagues/NBA_{season_end_year(season)}_advanced.html"
+
+    if session is None:
+        session = create_session(pool_size=1)
+    response = get_with_retry(session, league_url)
+
+    if response.status_code != 200:
+        raise Exception(f"Failed to retrieve league advanced stats for {season}. Status code: {response.status_code}")
+
+    return match_players_to_bbref(player_names, parse_league_advanced_table(response.content), known_slugs)
+
+def fetch_defensive_stats(player_names, season, max_workers=MAX_WORKERS, requests_per_minute=None, base_url=None, progress=None,
+                          slugs=None, on_result=None):
+    """
+    Scrapes DWS and DBPM for many players concurrently.
+
+    All workers share one pooled session and one token-bucket rate limiter, so
+    the combined request rate stays at `requests_per_minute` however many
+    workers are running.
+
+    Args:
+        player_names (list): Player names to scrape (e.g., ["LeBron James"]).
+        season (str): The season year in the format "YYYY-YY" (e.g., "2023-24").
+        max_workers (int): Number of concurrent workers. Defaults to MAX_WORKERS.
+        requests_per_minute (float): Combined request rate. Defaults to BBREF_REQUESTS_PER_MINUTE.
+        base_url (str): Basketball Reference root URL. Defaults to BBREF_BASE_URL.
+        progress (callable): Optional callback, called as progress(done, total) after every player.
+        slugs (dict): Optional player name -> Basketball Reference ID; other players' IDs are guessed.
+        on_result (callable): Optional callback, see scrape_concurrently.
+
+    Returns:
+        tuple: (results, errors), dictionaries keyed by player name holding the
+               defensive stats or the exception raised for that player.
+    """
+    if slugs is None:
+        slugs = {}
+    if requests_per_minute is None:
+        requests_per_minute = BBREF_REQUESTS_PER_MINUTE
+
+    session = create_session(pool_size=max_workers)
+    rate_limiter = RateLimiter.per_minute(requests_per_minute)
+
+    try:
+        return scrape_concurrently(
+            player_names,
+            lambda name: get_advanced_defensive_stats(name, season, session, rate_limiter, base_url, slugs.get(name)),
+            max_workers=max_workers,
+            progress=progress,
+            on_result=on_result
+        )
+    finally:
+        session.close()
+
+def fetch_player_data(season=CURRENT_SEASON, refresh=False, ttl_hours=None, progress=None):
+    """
+    Returns player data for a season, served from the on-disk snapshot when it is fresh.
+
+    Only goes to the network when there is no snapshot, the snapshot is older than
+    the TTL, or a refresh is explicitly requested. Freshly fetched data is written
+    back to the snapshot store.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        refresh (bool): If True, ignores any existing snapshot and re-fetches. Defaults to False.
+        ttl_hours (float): Maximum snapshot age in hours. Defaults to the configured TTL.
+        progress (callable): Optional callback, see fetch_player_data_from_api.
+
+    Returns:
+        PlayerStore: One row per player (see backend.store).
+    """
+    if not refresh:
+        player_stats = load_snapshot(season, ttl_hours)
+        if player_stats is not None:
+            return player_stats
+
+    player_stats = fetch_player_data_from_api(season, progress=progress)
+    save_snapshot(season, player_stats)
+
+    return player_stats
+
+def fetch_player_data_from_api(season=CURRENT_SEASON, bulk_defense=True, progress=None):
+    """
+    Fetches player data from the NBA API and Basketball Reference for a season.
+    Filters for players who averaged at least 25 minutes per game.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        bulk_defense (bool): If True, reads DWS and DBPM for every player from the single
+                             season-wide advanced table and only scrapes player pages for
+                             players that could not be matched. Defaults to True.
+        progress (callable): Optional callback, called as progress(stage, done, total) as
+                             the fetch advances. Raising from it aborts the fetch.
+
+    Returns:
+        PlayerStore: One row per player (see backend.store).
+    """
+    player_table = fetch_player_table(season, progress)
+    enriched = enrich_players(player_table, season, bulk_defense, progress)
+
+    return assemble_player_stats(player_table, enriched)
+
+def refresh_player_data(season=CURRENT_SEASON, bulk_defense=True, progress=None):
+    """
+    Incrementally refreshes the stored snapshot for a season.
+
+    The league-wide dashboards are re-fetched and diffed against the last snapshot
+    on DIFF_COLUMNS (games and minutes played). Per-player calls and scrapes only
+    run for players whose lines changed or who newly qualify; everyone else keeps
+    their stored name and defensive stats. Falls back to a full fetch when there
+    is no snapshot yet.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        bulk_defense (bool): See fetch_player_data_from_api. Defaults to True.
+        progress (callable): Optional callback, see fetch_player_data_from_api.
+
+    Returns:
+        PlayerStore: One row per player (see backend.store).
+    """
+    previous = load_snapshot(season, ttl_hours=float('inf'))
+    if not previous or (previous.player_ids == UNKNOWN_PLAYER_ID).any():
+        return fetch_player_data(season, refresh=True, progress=progress)
+
+    player_table = fetch_player_table(season, progress)
+
+    # Players whose games or minutes moved since the snapshot, plus newly qualifying ones
+    rows = previous.rows_for_ids(player_table.index)
+    known = rows >= 0
+    current = player_table[DIFF_COLUMNS].to_numpy(dtype=np.float64)
+    stored = np.column_stack([previous.column(column)[rows] for column in DIFF_COLUMNS])
+    changed = ~known | ~np.isclose(current, stored, rtol=1e-6, atol=0).all(axis=1)
+
+    # Everyone else keeps their stored name and defensive stats
+    dbpm, dws = previous.column('DBPM'), previous.column('DWS')
+    enriched = {
+        player_id: {'name': previous.names[row], 'DBPM': dbpm[row], 'DWS': dws[row]}
+        for player_id, row in zip(player_table.index[known], rows[known])
+    }
+    enriched.update(enrich_players(player_table[changed], season, bulk_defense, progress))
+
+    player_stats = assemble_player_stats(player_table, enriched)
+    save_snapshot(season, player_stats)
+
+    return player_stats
+
+def fetch_player_table(season=CURRENT_SEASON, progress=None):
+    """
+    Fetches the league-wide frames for a season and joins them into the player table.
+
+    The all-time draft combine does not change during a season, so it is served
+    from the on-disk frame cache for up to STATIC_FRAME_TTL_HOURS.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        progress (callable): Optional callback, see fetch_player_data_from_api.
+
+    Returns:
+        pd.DataFrame: Table indexed by PLAYER_ID, see build_player_table.
+    """
+    if progress is None:
+        progress = lambda stage, done, total: None
+
+    # Fetch every league-wide frame concurrently, except cached static ones
+    progress('League stats', 0, 1)
+    with stage('League stats'):
+        static_frames = {key: load_frame(key, STATIC_FRAME_TTL_HOURS) for key in STATIC_LEAGUE_ENDPOINTS}
+        league_frames = fetch_league_frames(season, [key for key in LEAGUE_ENDPOINTS if static_frames.get(key) is None])
+        for key, frame in static_frames.items():
+            if frame is None:
+                save_frame(key, league_frames[key])
+            else:
+                league_frames[key] = frame
+    progress('League stats', 1, 1)
+
+    # The team stats come along for free; store this season's league constants
+    if league_frames.get('team') is not None:
+        set_league_context(season, league_context_from_team_stats(league_frames['team']))
+
+    # Join every league-wide frame onto the qualifying players once
+    with stage('Player table'):
+        return build_player_table(
+            league_frames['general'], league_frames['per100'], league_frames['bio'], league_frames['clutch'], league_frames['combine']
+        )
+
+def enrich_players(player_table, season=CURRENT_SEASON, bulk_defense=True, progress=None, resume=True):
+    """
+    Runs the per-player enrichment: display names and defensive stats.
+
+    Display names are the league-wide PLAYER_NAMEs. Defensive stats come from the
+    season-wide Basketball Reference table, matched on the Basketball Reference
+    IDs stored in the player index (see backend.player_index) or by name; IDs
+    learned from the table are added to the index. Player pages are only scraped
+    for players missing from the table, at their known or guessed ID (a guessed ID
+    that works is added to the index unless the name is ambiguous), or for
+    everyone when the table is unavailable.
+
+    Progress is checkpointed per player (see backend.checkpoint). A run that was
+    interrupted, or left players behind, picks up from the checkpoint: enriched
+    players are reused and only the missing or failed ones are fetched again. The
+    checkpoint is deleted once a run enriches every player.
+
+    Args:
+        player_table (pd.DataFrame): Players to enrich, indexed by PLAYER_ID (see build_player_table).
+        season (str): The NBA season (e.g., '2024-25').
+        bulk_defense (bool): See fetch_player_data_from_api. Defaults to True.
+        progress (callable): Optional callback, see fetch_player_data_from_api.
+        resume (bool): If True, reads and writes the season's checkpoint. Defaults to True.
+
+    Returns:
+        dict: PLAYER_ID -> {'name', 'DBPM', 'DWS'} for every player enriched successfully.
+              Players that failed are reported and left out.
+    """
+    if progress is None:
+        progress = lambda stage, done, total: None
+
+    index = PlayerIndex.load()
+    try:
+        with (EnrichmentCheckpoint(season) if resume else nullcontext()) as checkpoint:
+            enriched = _enrich_players(player_table, season, bulk_defense, progress, checkpoint, index)
+            if checkpoint is not None and len(enriched) == len(player_table):
+                checkpoint.discard()
+    finally:
+        index.save()
+
+    return enriched
+
+def _enrich_players(player_table, season, bulk_defense, progress, checkpoint, index):
+    # Players finished by an earlier, interrupted run, as long as their line has not moved since
+    lines = dict(zip(player_table.index, map(repr, player_table[DIFF_COLUMNS].itertuples(index=False, name=None))))
+    enriched = checkpoint.completed(lines) if checkpoint is not None else {}
+    if enriched:
+        print(f"Resuming enrichment for {season}: {len(enriched)} of {len(player_table)} players already done.")
+
+    # Display names come with the league-wide stats
+    names = player_table.loc[~player_table.index.isin(list(enriched)), 'PLAYER_NAME']
+    index.update_names(names)
+
+    def add(player_id, player_defense):
+        enriched[player_id] = {'name': names[player_id], 'DBPM': player_defense['DBPM'], 'DWS': player_defense['DWS']}
+        if checkpoint is not None:
+            checkpoint.mark_done(player_id, lines[player_id], names[player_id], player_defense['DBPM'], player_defense['DWS'])
+
+    def drop(player_id, reason):
+        print(f"Error fetching data for {names[player_id]}: {reason}")
+        record_dropped_player(names[player_id], 'Defensive stats', reason)
+        if checkpoint is not None:
+            checkpoint.mark_failed(player_id, lines[player_id], 'Defensive stats', reason, names[player_id])
+
+    # Defense stats: one season-wide page, with per-player pages only for unmatched players
+    with stage('Defensive stats'):
+        league_table_read = False
+        if bulk_defense and len(names):
+            progress('Defensive stats', 0, 1)
+            try:
+                league_defense = fetch_league_defensive_stats(names, season, known_slugs=index.slugs(names.index))
+                league_table_read = True
+            except Exception as e:
+                print(f"Warning: Bulk defensive stats unavailable, scraping player pages instead: {e}")
+
+        if league_table_read:
+            index.update_slugs(league_defense['slug'])
+            with checkpoint.batch() if checkpoint is not None else nullcontext():
+                for player_id, player_defense in league_defense[['DWS', 'DBPM']].to_dict('index').items():
+                    add(player_id, player_defense)
+
+        # Players missing from a season table that was read (a nickname, or a name shared
+        # by several players) get one try at the page of their guessed ID
+        unmatched = names[~names.index.isin(list(enriched))]
+        slugs = index.slugs(unmatched.index)
+        guessed = {}
+        ambiguous = set(league_defense.attrs.get('ambiguous', ())) if league_table_read else set()
+        if league_table_read:
+            for player_id in unmatched.index.difference(list(slugs)):
+                try:
+                    guessed[player_id] = guess_bbref_slug(names[player_id])
+                except ValueError as e:
+                    drop(player_id, f"{missing_reason(player_id in ambiguous)} {e}")
+            slugs.update(guessed)
+            unmatched = unmatched[unmatched.index.isin(list(slugs))]
+
+        # Scraped pages are checkpointed one by one as they arrive
+        ids_by_name = dict(zip(unmatched, unmatched.index))
+
+        def on_result(name, player_defense, error):
+            player_id = ids_by_name[name]
+            if error is None:
+                add(player_id, player_defense)
+                # A guessed ID is only learned when the name could not belong to another player
+                if player_id in guessed and player_id not in ambiguous:
+                    index.update_slugs({player_id: guessed[player_id]})
+            elif player_id in guessed:
+                drop(player_id, f"{missing_reason(player_id in ambiguous)} Guessed page failed: {error}")
+            else:
+                drop(player_id, error)
+
+        if len(unmatched):
+            fetch_defensive_stats(
+                list(unmatched), season,
+                progress=lambda done, total: progress('Defensive stats', done, total),
+                slugs={name: slugs[player_id] for player_id, name in unmatched.items() if player_id in slugs},
+                on_result=on_result
+            )
+
+    return enriched
+
+def missing_reason(ambiguous):
+    """
+    Explains why a player could not be matched to the Basketball Reference season table.
+
+    Args:
+        ambiguous (bool): Whether the player's name matches several rows of the table.
+
+    Returns:
+        str: The reason, as reported for dropped players.
+    """
+    if ambiguous:
+        return "Name matches more than one player in the Basketball Reference season table."
+    return "Not found in the Basketball Reference season table."
+
+def assemble_player_stats(player_table, enriched):
+    """
+    Combines the league-wide stats with the per-player enrichment.
+
+    Args:
+        player_table (pd.DataFrame): Table indexed by PLAYER_ID (see build_player_table).
+        enriched (dict): PLAYER_ID -> {'name', 'DBPM', 'DWS'} (see enrich_players).
+
+    Returns:
+        PlayerStore: One row per enriched player, in player table order. DBPM and DWS
+                     are parsed to numbers; a repeated display name keeps its last row and
+                     the others are recorded as dropped.
+    """
+    table = player_table.loc[player_table.index.isin(list(enriched)), STAT_COLUMNS]
+    player_ids = table.index
+
+    # Combine stats
+    table['DBPM'] = [enriched[player_id]['DBPM'] for player_id in player_ids]
+    table['DWS'] = [enriched[player_id]['DWS'] for player_id in player_ids]
+    table.insert(0, 'PLAYER_ID', player_ids)
+    table.insert(0, 'name', [enriched[player_id]['name'] for player_id in player_ids])
+    duplicated = table.duplicated('name', keep='last')
+    for player_id, name in table.loc[duplicated, 'name'].items():
+        record_dropped_player(name, 'Player table', f"duplicate display name (PLAYER_ID {player_id})")
+    table = table[~duplicated]
+
+    return PlayerStore.from_frame(table.reset_index(drop=True))
+
+def build_player_table(general_stats_df, general_stats_per100_df, bio_stats_df, clutch_stats_df, combine_stats_df, min_minutes=MIN_MINUTES):
+    """
+    Joins the league-wide stat frames into a single wide table, one row per qualifying player.
+
+    Every frame is indexed by PLAYER_ID and left-joined onto the general stats once,
+    instead of being filtered per player. Players missing from an optional frame
+    get the column defaults from COLUMN_DEFAULTS; players missing from the bio
+    stats (which carry Height and Weight) are dropped.
+
+    Args:
+        general_stats_df (pd.DataFrame): LeagueDashPlayerStats totals.
+        general_stats_per100_df (pd.DataFrame): LeagueDashPlayerStats per 100 possessions.
+        bio_stats_df (pd.DataFrame): LeagueDashPlayerBioStats.
+        clutch_stats_df (pd.DataFrame): LeagueDashPlayerClutch.
+        combine_stats_df (pd.DataFrame): DraftCombineStats (all time).
+        min_minutes (float): Minimum MIN required to qualify. Defaults to MIN_MINUTES.
+
+    Returns:
+        pd.DataFrame: Table indexed by PLAYER_ID with PLAYER_NAME and every column in STAT_COLUMNS.
+    """
+    qualified = general_stats_df[general_stats_df['MIN'] >= min_minutes]
+    table = qualified.drop_duplicates('PLAYER_ID').set_index('PLAYER_ID')
+    table = table[['PLAYER_NAME'] + list(GENERAL_COLUMNS)].rename(columns=GENERAL_COLUMNS)
+    table['TmMP'] = table['GP'] * 48  # Assuming 48 minutes per game
+
+    # Height and Weight have no sensible default, so the bio stats are required
+    missing_bio = ~table.index.isin(bio_stats_df['PLAYER_ID'])
+    for full_name in table.loc[missing_bio, 'PLAYER_NAME']:
+        print(f"Error fetching data for {full_name}: no bio stats found")
+        record_dropped_player(full_name, 'Player table', 'no bio stats found')
+    table = table[~missing_bio]
+
+    table = _left_join(table, general_stats_per100_df, PER100_COLUMNS)
+    table = _left_join(table, bio_stats_df, BIO_COLUMNS)
+    table = _left_join(table, clutch_stats_df, CLUTCH_COLUMNS)
+    table = _left_join(table, combine_stats_df, COMBINE_COLUMNS)
+
+    return table
+
+def _left_join(table, frame, columns):
+    """
+    Left-joins selected columns of a league-wide frame onto the player table by PLAYER_ID.
+
+    Only players with no row in `frame` get the defaults; a missing value in an
+    existing row is kept as is. Duplicate PLAYER_IDs keep their first row.
+    """
+    frame = frame.drop_duplicates('PLAYER_ID').set_index('PLAYER_ID')
+    joined = frame[list(columns)].rename(columns=columns).reindex(table.index)
+
+    missing = ~table.index.isin(frame.index)
+    for column in joined.columns:
+        joined.loc[missing, column] = COLUMN_DEFAULTS.get(column, 0)
+
+    return table.join(joined)
 
 def get_nba_efg(season):
     """
@@ -191,24 +731,115 @@ def get_nba_efg(season):
     """
     try:
         # Fetch team stats for the given season
-        team_stats = leaguedashteamstats.LeagueDashTeamStats(
-            season=season,
-            measure_type_detailed_defense='Advanced'  # Get advanced stats
-        ).get_data_frames()[0]
+        team_stats = call_nba_api(lambda: LEAGUE_ENDPOINTS['team'](season, NBA_API_TIMEOUT))
+
+        return league_efg_from_team_stats(team_stats)
 
-        # Calculate the league-wide eFG%
-        league_efg = team_stats['EFG_PCT'].mean()
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def league_efg_from_team_stats(team_stats):
+    """
+    Calculates the league-wide eFG% from advanced team stats.
+
+    Args:
+        team_stats (pd.DataFrame): LeagueDashTeamStats with measure type 'Advanced'.
 
-        return league_efg
+    Returns:
+        float: The mean team eFG%.
+    """
+    return team_stats['EFG_PCT'].mean()
+
+def league_context_from_team_stats(team_stats):
+    """
+    Calculates the league-wide constants used by the model from advanced team stats.
+
+    Args:
+        team_stats (pd.DataFrame): LeagueDashTeamStats with measure type 'Advanced'.
+
+    Returns:
+        dict: League averages keyed by name (e.g., {'efg': 0.54, 'ts': 0.57, 'pace': 99.1}).
+    """
+    context = {'efg': float(league_efg_from_team_stats(team_stats))}
+    for key, column in LEAGUE_CONTEXT_COLUMNS.items():
+        if column in team_stats.columns:
+            context[key] = float(team_stats[column].mean())
+    return context
+
+def get_league_context_from_api(season):
+    """
+    Fetches the league-wide constants for a season from the NBA API.
+
+    Args:
+        season (str): The NBA season (e.g., '2023-24').
+
+    Returns:
+        dict: League averages keyed by name, or None if an error occurs.
+    """
+    try:
+        team_stats = call_nba_api(lambda: LEAGUE_ENDPOINTS['team'](season, NBA_API_TIMEOUT))
+        return league_context_from_team_stats(team_stats)
 
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
 
-# Example usage: Get eFG% for the 2023-24 season
-current_season = '2024-25'
-efg = get_nba_efg(current_season)
+def call_nba_api(request):
+    """
+    Runs an NBA API request under the shared concurrency limit.
+
+    Args:
+        request (callable): Function taking no arguments and returning an nba_api endpoint.
+
+    Returns:
+        pd.DataFrame: The endpoint's first data frame.
+    """
+    with NBA_API_SEMAPHORE:
+        start = time.perf_counter()
+        try:
+            df = request().get_data_frames()[0]
+        except Exception:
+            record_request(NBA_API_HOST, time.perf_counter() - start)
+            raise
+        record_request(NBA_API_HOST, time.perf_counter() - start, 200)
+        return df
+
+def fetch_league_frames(season, endpoints=None, max_workers=NBA_API_MAX_CONCURRENCY, timeout=NBA_API_TIMEOUT):
+    """
+    Fetches the league-wide NBA API frames for a season concurrently.
+
+    The requests do not depend on each other, so they are issued together on a
+    thread pool and the bulk phase takes about as long as the slowest call. Every
+    call also goes through the shared NBA_API_SEMAPHORE.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        endpoints (list): Optional keys of LEAGUE_ENDPOINTS to fetch. Defaults to all of them.
+        max_workers (int): Number of concurrent requests. Defaults to NBA_API_MAX_CONCURRENCY.
+        timeout (float): Per-request timeout in seconds. Defaults to NBA_API_TIMEOUT.
+
+    Returns:
+        dict: Frames keyed by endpoint name. Failures of optional endpoints are
+              reported and stored as None; failures of required ones are raised.
+    """
+    if endpoints is None:
+        endpoints = list(LEAGUE_ENDPOINTS)
+
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(call_nba_api, lambda key=key: LEAGUE_ENDPOINTS[key](season, timeout)): key
+            for key in endpoints
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                frames[key] = future.result()
+            except Exception as e:
+                if key not in OPTIONAL_LEAGUE_ENDPOINTS:
+                    raise
+                print(f"Warning: Could not fetch {key} stats for {season}: {e}")
+                frames[key] = None
 
-if efg:
-    # Save to config file
-    set_league_efg(efg)
\ No newline at end of file
+    return frames
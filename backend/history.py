@@ -0,0 +1,136 @@
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import data_fetcher
+from .data_fetcher import fetch_player_data
+from .league import get_league_context
+from .moda import ScoringDataset, calculate_advanced_stats, scale_objectives
+
+# --- Multi-Season Defaults ---
+# Seasons built at once; each worker process fetches (or loads) one season.
+# The NBA API and Basketball Reference limits are split between the workers.
+MAX_SEASON_WORKERS = 4
+
+def season_range(first_start_year, last_start_year):
+    """
+    Lists the season strings between two start years, inclusive.
+
+    Args:
+        first_start_year (int): Start year of the first season (e.g., 2004 for '2004-05').
+        last_start_year (int): Start year of the last season (e.g., 2024 for '2024-25').
+
+    Returns:
+        list: Season strings (e.g., ['2004-05', ..., '2024-25']).
+    """
+    return [f"{year}-{str(year + 1)[-2:]}" for year in range(first_start_year, last_start_year + 1)]
+
+def build_season_stats(season, refresh=False):
+    """
+    Builds the advanced stats table for one season.
+
+    Runs in a worker process. The season's data comes from its own on-disk
+    snapshot when fresh, so every season is cached independently.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        refresh (bool): If True, ignores the season's snapshot and re-fetches. Defaults to False.
+
+    Returns:
+        pd.DataFrame: Advanced stats with a 'season' column after 'name'.
+    """
+    player_stats = fetch_player_data(season, refresh=refresh)
+    df = calculate_advanced_stats(player_stats, season)
+    if not df.empty:
+        df.insert(1, 'season', season)
+    return df
+
+def share_rate_limits(workers):
+    """
+    Gives this process its share of the request limits, as the initializer of a season worker.
+
+    Every process has its own NBA API semaphore and Basketball Reference rate
+    limiter, so each worker gets 1/`workers` of NBA_API_MAX_CONCURRENCY and
+    BBREF_REQUESTS_PER_MINUTE and the pool as a whole stays within the limits.
+
+    Args:
+        workers (int): Number of worker processes sharing the limits.
+    """
+    data_fetcher.NBA_API_SEMAPHORE = threading.BoundedSemaphore(max(1, data_fetcher.NBA_API_MAX_CONCURRENCY // workers))
+    data_fetcher.BBREF_REQUESTS_PER_MINUTE = data_fetcher.BBREF_REQUESTS_PER_MINUTE / workers
+
+def build_all_season_stats(seasons, max_workers=MAX_SEASON_WORKERS, refresh=False):
+    """
+    Builds the advanced stats tables for many seasons in a process pool.
+
+    Seasons that fail are reported and left out rather than failing the whole run.
+    The workers split the request limits between them (see share_rate_limits), and
+    there are never more workers than concurrent NBA API requests allowed.
+
+    Args:
+        seasons (list): Season strings (e.g., from season_range).
+        max_workers (int): Number of worker processes. Defaults to MAX_SEASON_WORKERS.
+        refresh (bool): If True, re-fetches every season. Defaults to False.
+
+    Returns:
+        dict: Advanced stats DataFrame per season, in the order of `seasons`.
+    """
+    season_stats = {}
+    if not seasons:
+        return season_stats
+    workers = max(1, min(max_workers, len(seasons), data_fetcher.NBA_API_MAX_CONCURRENCY))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=share_rate_limits, initargs=(workers,)) as executor:
+        futures = {executor.submit(build_season_stats, season, refresh): season for season in seasons}
+        for future in as_completed(futures):
+            season = futures[future]
+            try:
+                season_stats[season] = future.result()
+            except Exception as e:
+                print(f"Error building data for the {season} season: {e}")
+
+    return {season: season_stats[season] for season in seasons if season in season_stats}
+
+def prepare_multi_season_dataset(seasons, normalization='season', season_stats=None, max_workers=MAX_SEASON_WORKERS, refresh=False):
+    """
+    Builds a ScoringDataset ranking player-seasons across many seasons.
+
+    Args:
+        seasons (list): Season strings (e.g., from season_range).
+        normalization (str): 'season' returns each season to scale on its own, so players
+                             are compared with their own era; 'global' scales all seasons
+                             together. Defaults to 'season'.
+        season_stats (dict): Optional prebuilt advanced stats per season. Built with
+                             build_all_season_stats if not given.
+        max_workers (int): Number of worker processes. Defaults to MAX_SEASON_WORKERS.
+        refresh (bool): If True, re-fetches every season. Defaults to False.
+
+    Returns:
+        ScoringDataset: Dataset with one row per player-season; `seasons` holds each row's season.
+    """
+    if normalization not in ('season', 'global'):
+        raise ValueError(f"Unknown normalization: {normalization}")
+
+    if season_stats is None:
+        season_stats = build_all_season_stats(seasons, max_workers, refresh)
+
+    frames = [df for df in season_stats.values() if not df.empty]
+    if not frames:
+        print("Warning: No player data available to score.")
+        return ScoringDataset([], [], np.empty((0, 0)), np.empty(0), stats=pd.DataFrame(), seasons=[])
+
+    df = pd.concat(frames, ignore_index=True)
+    league_context = {season: get_league_context(season) for season in season_stats}
+
+    if normalization == 'global':
+        objectives, scaled, ideal = scale_objectives(df)
+    else:
+        blocks = [scale_objectives(frame) for frame in frames]
+        objectives = blocks[0][0]
+        scaled = np.vstack([block[1] for block in blocks])
+        ideal = np.max([block[2] for block in blocks], axis=0)
+
+    return ScoringDataset(
+        df['name'].to_numpy(), objectives, scaled, ideal,
+        stats=df, league_context=league_context, seasons=df['season'].to_numpy()
+    )
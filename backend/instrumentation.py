@@ -0,0 +1,236 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+# Report currently being recorded into, or None when instrumentation is disabled.
+# Every recording function checks this first, so a disabled run pays one global lookup per call.
+_ACTIVE_REPORT = None
+
+# Returned by stage() while disabled; entering and leaving it does nothing
+_NULL_STAGE = nullcontext()
+
+class RunReport:
+    """
+    Structured record of one pipeline run.
+
+    Collects per-stage wall time, HTTP request counts and latencies per host,
+    retries, cache hits and misses, and the players dropped along the way with
+    the reason. Safe to record into from worker threads.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stages = {}
+        self.http = {}
+        self.cache = {}
+        self.dropped_players = []
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds):
+        """Adds one timed run of a stage; repeated runs are summed."""
+        with self._lock:
+            stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            stage['calls'] += 1
+            stage['seconds'] += seconds
+
+    def add_request(self, host, seconds, status=None):
+        """Adds one HTTP request to a host; `status` is the status code, or None if it raised."""
+        with self._lock:
+            stats = self._host(host)
+            stats['requests'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            key = 'error' if status is None else str(status)
+            stats['status'][key] = stats['status'].get(key, 0) + 1
+
+    def add_retry(self, host):
+        """Adds one retried request to a host."""
+        with self._lock:
+            self._host(host)['retries'] += 1
+
+    def add_cache_lookup(self, cache, hit):
+        """Adds one lookup in a named cache (e.g. 'snapshot')."""
+        with self._lock:
+            stats = self.cache.setdefault(cache, {'hits': 0, 'misses': 0})
+            stats['hits' if hit else 'misses'] += 1
+
+    def add_dropped_player(self, player, stage, reason):
+        """Records a player left out of the results, the stage it happened in and why."""
+        with self._lock:
+            self.dropped_players.append({'player': str(player), 'stage': stage, 'reason': str(reason)})
+
+    def _host(self, host):
+        return self.http.setdefault(
+            host, {'requests': 0, 'retries': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'status': {}}
+        )
+
+    def to_dict(self):
+        """
+        Returns the report as plain data.
+
+        Returns:
+            dict: 'started_at', 'wall_seconds', 'stages', 'http' (with 'mean_seconds' per host),
+                  'cache' and 'dropped_players'.
+        """
+        with self._lock:
+            finished_at = self.finished_at if self.finished_at is not None else time.time()
+            http = {}
+            for host, stats in self.http.items():
+                http[host] = dict(stats, status=dict(stats['status']))
+                http[host]['mean_seconds'] = stats['total_seconds'] / stats['requests'] if stats['requests'] else 0.0
+
+            return {
+                'started_at': self.started_at,
+                'wall_seconds': finished_at - self.started_at,
+                'stages': {name: dict(stage) for name, stage in self.stages.items()},
+                'http': http,
+                'cache': {name: dict(stats) for name, stats in self.cache.items()},
+                'dropped_players': list(self.dropped_players)
+            }
+
+    def to_json(self, path=None):
+        """
+        Serializes the report to JSON.
+
+        Args:
+            path (str): Optional file to write the JSON to.
+
+        Returns:
+            str: The JSON document.
+        """
+        document = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
+
+def enable(report=None):
+    """
+    Starts recording into a report.
+
+    Args:
+        report (RunReport): Report to record into. A new one is created if not given.
+
+    Returns:
+        RunReport: The active report.
+    """
+    global _ACTIVE_REPORT
+    _ACTIVE_REPORT = report if report is not None else RunReport()
+    return _ACTIVE_REPORT
+
+def disable():
+    """
+    Stops recording.
+
+    Returns:
+        RunReport: The report that was active, or None.
+    """
+    global _ACTIVE_REPORT
+    report, _ACTIVE_REPORT = _ACTIVE_REPORT, None
+    if report is not None and report.finished_at is None:
+        report.finished_at = time.time()
+    return report
+
+def get_active_report():
+    """Returns the report currently being recorded into, or None when disabled."""
+    return _ACTIVE_REPORT
+
+@contextmanager
+def recording(report=None):
+    """
+    Records everything run inside the block into a report.
+
+    The previously active report (if any) is restored afterwards.
+
+    Args:
+        report (RunReport): Report to record into. A new one is created if not given.
+
+    Yields:
+        RunReport: The report being recorded into.
+    """
+    global _ACTIVE_REPORT
+    previous = _ACTIVE_REPORT
+    report = enable(report)
+    try:
+        yield report
+    finally:
+        report.finished_at = time.time()
+        _ACTIVE_REPORT = previous
+
+class _StageTimer:
+    """Context manager adding its wall time to a report stage."""
+
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.report.add_stage(self.name, time.perf_counter() - self.start)
+
+def stage(name):
+    """
+    Times the enclosed block as a pipeline stage.
+
+    Args:
+        name (str): Stage name (e.g., 'League stats').
+
+    Returns:
+        Context manager; a shared no-op one when instrumentation is disabled.
+    """
+    report = _ACTIVE_REPORT
+    if report is None:
+        return _NULL_STAGE
+    return _StageTimer(report, name)
+
+def timed(name):
+    """
+    Decorator timing every call of a function as a pipeline stage.
+
+    Args:
+        name (str): Stage name (e.g., 'Return to scale').
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            report = _ACTIVE_REPORT
+            if report is None:
+                return function(*args, **kwargs)
+            with _StageTimer(report, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def url_host(url):
+    """Returns the host part of a URL, used to group HTTP statistics."""
+    return urlsplit(url).netloc or url
+
+def record_request(host, seconds, status=None):
+    """Records one HTTP request, see RunReport.add_request."""
+    report = _ACTIVE_REPORT
+    if report is not None:
+        report.add_request(host, seconds, status)
+
+def record_retry(host):
+    """Records one retried HTTP request, see RunReport.add_retry."""
+    report = _ACTIVE_REPORT
+    if report is not None:
+        report.add_retry(host)
+
+def record_cache_lookup(cache, hit):
+    """Records one cache lookup, see RunReport.add_cache_lookup."""
+    report = _ACTIVE_REPORT
+    if report is not None:
+        report.add_cache_lookup(cache, hit)
+
+def record_dropped_player(player, stage, reason):
+    """Records a dropped player, see RunReport.add_dropped_player."""
+    report = _ACTIVE_REPORT
+    if report is not None:
+        report.add_dropped_player(player, stage, reason)
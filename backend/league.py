@@ -0,0 +1,73 @@
+from .config import get_league_efg as get_league_efg_override, CURRENT_SEASON
+from .cache import load_league_context, save_league_context
+
+# In-memory league context per season, filled on first use
+_LEAGUE_CONTEXT = {}
+
+def get_league_context(season=CURRENT_SEASON, refresh=False):
+    """
+    Returns the league-wide constants for a season, computing them on first use.
+
+    Looks in memory first, then in the on-disk cache, and only then asks the
+    NBA API. Nothing is fetched until a caller actually needs the values, so
+    importing the backend never touches the network.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        refresh (bool): If True, ignores memoized and cached values and re-fetches. Defaults to False.
+
+    Returns:
+        dict: League constants, e.g. {'efg': 0.54, 'ts': 0.57, 'pace': 99.1}.
+              Values are None if they could not be fetched.
+    """
+    if not refresh:
+        if season in _LEAGUE_CONTEXT:
+            return _LEAGUE_CONTEXT[season]
+
+        context = load_league_context(season)
+        if context is not None:
+            _LEAGUE_CONTEXT[season] = context
+            return context
+
+    # Imported here to keep the provider free of import-time dependencies on the fetcher
+    from .data_fetcher import get_league_context_from_api
+
+    context = get_league_context_from_api(season)
+    if context is None:
+        # Remember the failure for this session only, so it is retried next run
+        _LEAGUE_CONTEXT[season] = {'efg': None}
+        return _LEAGUE_CONTEXT[season]
+
+    set_league_context(season, context)
+    return context
+
+def set_league_context(season, context, persist=True):
+    """
+    Stores the league-wide constants for a season.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+        context (dict): League constants, e.g. {'efg': 0.54}.
+        persist (bool): If True, also writes them to the on-disk cache. Defaults to True.
+    """
+    _LEAGUE_CONTEXT[season] = context
+    if persist:
+        save_league_context(season, context)
+
+def get_league_efg(season=CURRENT_SEASON):
+    """
+    Returns the league-wide eFG% for a season.
+
+    A value set with config.set_league_efg takes precedence over the fetched one.
+
+    Args:
+        season (str): The NBA season (e.g., '2024-25').
+
+    Returns:
+        float: The league-wide eFG%, or None if unavailable.
+    """
+    override = get_league_efg_override()
+    if override is not None:
+        return override
+
+    return get_league_context(season).get('efg')
@@ -1,6 +1,10 @@
 from .data_fetcher import fetch_player_data
-from .utils import polynomial_return_to_scale
-from .config import get_league_efg
+from .utils import top_k_order
+from .config import CURRENT_SEASON
+from .league import get_league_context, get_league_efg
+from .instrumentation import stage, timed
+from .store import PlayerStore
+from .value_functions import ValueFunction, apply_value_functions, polynomial
 import pandas as pd
 import numpy as np
 
@@ -42,80 +46,272 @@ POLYNOMIAL_DEGREES = {
     'Clutch': 2
 }
 
-def calculate_mvp_rankings(weights=None):
+# --- Default Value Functions ---
+# Polynomial return-to-scale between the column minimum and maximum, with the
+# direction inferred from the sign of the column mean
+DEFAULT_VALUE_FUNCTIONS = {
+    name: polynomial(degree, direction='auto') for name, degree in POLYNOMIAL_DEGREES.items()
+}
+
+class ScoringDataset:
+    """
+    A prepared, in-memory MODA scoring dataset.
+
+    Holds the return-to-scale objective matrix for every player so that applying
+    a new set of weights is a single matrix-vector product, with no fetching or
+    re-scaling involved.
+
+    Attributes:
+        names (np.ndarray): Player names, one per row of `scaled`.
+        objectives (list): Objective names, one per column of `scaled`.
+        scaled (np.ndarray): 2-D array (players x objectives) of values on a 0-100 scale.
+        ideal (np.ndarray): Scaled values of the 'Ideal' row, one per objective.
+        stats (pd.DataFrame): The advanced stats the matrix was built from.
+        league_context (dict): League constants (eFG%, ...) the stats were derived with.
+        seasons (np.ndarray): Season of each row for multi-season datasets, otherwise None.
     """
-    Calculates MVP rankings using the MODA model.
+
+    def __init__(self, names, objectives, scaled, ideal, stats=None, league_context=None, seasons=None):
+        self.names = np.asarray(names, dtype=object)
+        self.objectives = list(objectives)
+        self.scaled = np.asarray(scaled, dtype=np.float64)
+        self.ideal = np.asarray(ideal, dtype=np.float64)
+        self.stats = stats
+        self.league_context = league_context or {}
+        self.seasons = None if seasons is None else np.asarray(seasons, dtype=object)
+        self._objective_index = {name: i for i, name in enumerate(self.objectives)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def subset(self, rows):
+        """
+        Returns a dataset with only some of the players.
+
+        The scaled values are kept as they are (not re-scaled to the subset), so
+        scores stay comparable to the full dataset.
+
+        Args:
+            rows (array-like): Row indices or boolean mask of the players to keep.
+
+        Returns:
+            ScoringDataset: The reduced dataset.
+        """
+        rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows, dtype=np.int64)
+        return ScoringDataset(
+            self.names[rows], self.objectives, self.scaled[rows], self.ideal,
+            stats=None if self.stats is None else self.stats.iloc[rows].reset_index(drop=True),
+            league_context=self.league_context,
+            seasons=None if self.seasons is None else self.seasons[rows]
+        )
+
+    def weight_vector(self, weights):
+        """
+        Converts a weights dictionary into a vector aligned with the objective columns.
+
+        Args:
+            weights (dict): Dictionary of weights for each objective. Objectives not
+                            present in the dataset are ignored.
+
+        Returns:
+            np.ndarray: Weight for each objective column (0 where not given).
+        """
+        vector = np.zeros(len(self.objectives))
+        for name, weight in weights.items():
+            i = self._objective_index.get(name)
+            if i is not None:
+                vector[i] = weight
+        return vector
+
+    @timed('Scoring')
+    def score(self, weights):
+        """
+        Calculates the MVP score of every player for a set of weights.
+
+        Args:
+            weights (dict): Dictionary of weights for each objective.
+
+        Returns:
+            np.ndarray: MVP score for each player, in dataset order.
+        """
+        return self.scaled @ self.weight_vector(weights)
+
+    def rank(self, weights, limit=None):
+        """
+        Ranks the players for a set of weights.
+
+        Args:
+            weights (dict): Dictionary of weights for each objective.
+            limit (int): Optional number of leaders to return. Only the leaders are
+                         sorted, the rest are partitioned off in linear time.
+
+        Returns:
+            list: List of dictionaries, each containing player name and MVP score
+                  (and season, for multi-season datasets), sorted from highest to lowest score.
+        """
+        scores = self.score(weights)
+        order = np.argsort(-scores, kind='stable') if limit is None else top_k_order(scores, limit)
+        if self.seasons is not None:
+            return [{'name': self.names[i], 'season': self.seasons[i], 'MVP Score': float(scores[i])} for i in order]
+        return [{'name': self.names[i], 'MVP Score': float(scores[i])} for i in order]
+
+def prepare_scoring_dataset(player_stats=None, season=CURRENT_SEASON, progress=None, value_functions=None):
+    """
+    Builds a ScoringDataset from player data.
+
+    Runs everything that does not depend on the weights once: fetching (if needed),
+    derived-stat computation, the 'Ideal' row and return-to-scale.
 
     Args:
-        weights (dict): Optional dictionary of weights for each objective.
+        player_stats (PlayerStore): Optional player data as returned by fetch_player_data
+                                    (a dictionary of stats per player also works).
+                                    Fetched for `season` if not given.
+        season (str): The NBA season (e.g., '2024-25'). Defaults to the current season.
+        progress (callable): Optional callback passed to fetch_player_data.
+        value_functions (dict): Optional ValueFunction per objective, see scale_objectives.
 
     Returns:
-        list: List of dictionaries, each containing player name and MVP score.
+        ScoringDataset: The prepared dataset.
     """
-    if weights is None:
-        weights = DEFAULT_WEIGHTS
-
     # 1. Fetch Data
-    player_stats = fetch_player_data()
+    if player_stats is None:
+        player_stats = fetch_player_data(season, progress=progress)
 
     # 2. Calculate Advanced Stats and Value Scores
-    df = calculate_advanced_stats(player_stats)
+    df = calculate_advanced_stats(player_stats, season)
+    league_context = get_league_context(season)
 
-    # --- Create 'Ideal' row ---
-    if 'name' in df.columns:
-        ideal_row = pd.DataFrame([['Ideal'] + [df[col].max() for col in df.columns if col != 'name']], columns=df.columns)
-        df = pd.concat([df, ideal_row], ignore_index=True)
+    if 'name' not in df.columns:
+        print("Warning: No player data available to score.")
+        return ScoringDataset([], [], np.empty((0, 0)), np.empty(0), stats=df, league_context=league_context)
+
+    objectives, scaled, ideal = scale_objectives(df, value_functions=value_functions)
+    return ScoringDataset(df['name'].to_numpy(), objectives, scaled, ideal, stats=df, league_context=league_context)
+
+def resolve_value_functions(objectives, degrees=None, value_functions=None):
+    """
+    Resolves the value function of every objective.
+
+    Args:
+        objectives (list): Objective names.
+        degrees (dict): Optional polynomial degree per objective, applied to the
+                        default value function.
+        value_functions (dict): Optional ValueFunction (or its JSON form) per objective;
+                                takes precedence over `degrees`.
+
+    Returns:
+        list: One ValueFunction per objective.
+    """
+    degrees = degrees or {}
+    value_functions = value_functions or {}
+
+    functions = []
+    for name in objectives:
+        function = value_functions.get(name)
+        if function is None:
+            function = DEFAULT_VALUE_FUNCTIONS.get(name, polynomial(1, direction='auto'))
+            if name in degrees:
+                function = polynomial(degrees[name], direction='auto')
+        elif not isinstance(function, ValueFunction):
+            function = ValueFunction.from_dict(function)
+        functions.append(function)
+    return functions
+
+def scale_objectives(df, degrees=None, value_functions=None):
+    """
+    Applies return-to-scale to the objective columns of an advanced stats table.
 
+    Args:
+        df (pd.DataFrame): Advanced stats as returned by calculate_advanced_stats.
+        degrees (dict): Optional polynomial degree per objective. Objectives not
+                        given use POLYNOMIAL_DEGREES.
+        value_functions (dict): Optional ValueFunction per objective. Objectives not
+                                given use DEFAULT_VALUE_FUNCTIONS (with `degrees`).
+
+    Returns:
+        tuple: (objectives, scaled, ideal) with the objective names, the scaled
+               2-D array (players x objectives) and the scaled 'Ideal' row.
+    """
     # --- Filter columns ---
-    df_filtered = df.copy()
     columns_to_keep = list(DEFAULT_WEIGHTS.keys())
-    try:
-        df_filtered = df_filtered[columns_to_keep]
-    except KeyError as e:
-        print(f"Warning: One or more columns from DEFAULT_WEIGHTS not found in DataFrame: {e}")
-        existing_columns = [col for col in columns_to_keep if col in df_filtered.columns]
-        df_filtered = df_filtered[existing_columns]
+    missing_columns = [col for col in columns_to_keep if col not in df.columns]
+    if missing_columns:
+        print(f"Warning: One or more columns from DEFAULT_WEIGHTS not found in DataFrame: {missing_columns}")
+    objectives = [name for name in columns_to_keep if name in df.columns]
+
+    functions = resolve_value_functions(objectives, degrees, value_functions)
+
+    # --- Create 'Ideal' row ---
+    # Filled straight into one matrix with the 'Ideal' row (each column's maximum) last.
+    # Non-numeric values are converted to NaN, and NaN to 0.
+    numeric_values = np.empty((len(df) + 1, len(objectives)))
+    for j, name in enumerate(objectives):
+        column = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        numeric_values[:-1, j] = column
+        numeric_values[-1, j] = np.fmax.reduce(column, initial=np.nan)
+    numeric_values[np.isnan(numeric_values)] = 0
 
     # --- Apply Return-to-Scale ---
-    scaled_values = {}
-    for name in df_filtered.columns:
-        if name in POLYNOMIAL_DEGREES:
-            # Ensure numeric values, converting non-numeric values to NaN
-            numeric_values = pd.to_numeric(df_filtered[name], errors='coerce').fillna(0)
+    matrix = apply_value_functions(numeric_values, functions, objectives)
+
+    # The 'auto' defaults keep each column's scaled maximum as the ideal; every other
+    # function's ideal is the value of its own ideal anchor
+    for j, function in enumerate(functions):
+        if function.direction != 'auto' or function.ideal is not None:
+            matrix[-1, j] = function.ideal_value()
 
-            scaled_values[name] = polynomial_return_to_scale(
-                numeric_values.tolist(),
-                degree=POLYNOMIAL_DEGREES.get(name, 1),
-                normal_scaling=(numeric_values.mean() >= 0)
-            )
+    # The last row is the 'Ideal' row; keep it apart so it is never ranked
+    return objectives, matrix[:-1], matrix[-1]
 
-    # Create a new DataFrame with scaled values
-    df_scaled = pd.DataFrame(scaled_values)
+def calculate_mvp_rankings(weights=None, dataset=None, limit=None):
+    """
+    Calculates MVP rankings using the MODA model.
 
-    # Concatenate player names (if available) with the scaled data
-    if 'name' in df.columns:
-        df_scaled = pd.concat([df['name'].reset_index(drop=True), df_scaled], axis=1)
+    Args:
+        weights (dict): Optional dictionary of weights for each objective.
+        dataset (ScoringDataset): Optional prepared dataset. Built from freshly
+                                  fetched data if not given.
+        limit (int): Optional number of leaders to return.
 
-    # --- Calculate Overall MVP Score ---
-    df_scaled['MVP Score'] = 0
-    for name, weight in weights.items():
-        if name in df_scaled.columns:
-            df_scaled['MVP Score'] += weight * df_scaled[name]
+    Returns:
+        list: List of dictionaries, each containing player name and MVP score.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
 
-    # Rank Players (excluding 'Ideal')
-    mvp_rankings = df_scaled[df_scaled['name'] != 'Ideal'][['name', 'MVP Score']].sort_values(by='MVP Score', ascending=False).to_dict('records')
+    if dataset is None:
+        dataset = prepare_scoring_dataset()
 
-    return mvp_rankings
+    return dataset.rank(weights, limit)
 
 # --- Helper Calculation Functions ---
-def calculate_box_creation(stats):
-    """Calculates Box Creation."""
-    shooting_proficiency = calculate_shooting_proficiency(stats)
-    return (stats['AST']/stats['GP']) * 0.1843 + ((stats['PTS']/stats['GP']) + (stats['TOV']/stats['GP'])) * 0.0969 - 2.3021 * shooting_proficiency + 0.0582 * ((stats['AST']/stats['GP']) * ((stats['PTS']/stats['GP']) + (stats['TOV']/stats['GP'])) * shooting_proficiency) - 1.1942
-
-def calculate_offensive_load(stats):
-    """Calculates Offensive Load."""
-    box_creation = calculate_box_creation(stats)
+# Each helper works on a single player's stats dictionary as well as on a whole
+# DataFrame of players, in which case every expression is evaluated column-wise.
+
+def calculate_box_creation(stats, shooting_proficiency=None):
+    """
+    Calculates Box Creation.
+
+    Args:
+        stats (dict or pd.DataFrame): Player stats.
+        shooting_proficiency: Optional precomputed Shooting Proficiency, to avoid recomputing it.
+    """
+    if shooting_proficiency is None:
+        shooting_proficiency = calculate_shooting_proficiency(stats)
+    ast = stats['AST']/stats['GP']
+    pts_tov = (stats['PTS']/stats['GP']) + (stats['TOV']/stats['GP'])
+    return ast * 0.1843 + pts_tov * 0.0969 - 2.3021 * shooting_proficiency + 0.0582 * (ast * pts_tov * shooting_proficiency) - 1.1942
+
+def calculate_offensive_load(stats, box_creation=None):
+    """
+    Calculates Offensive Load.
+
+    Args:
+        stats (dict or pd.DataFrame): Player stats.
+        box_creation: Optional precomputed Box Creation, to avoid recomputing it.
+    """
+    if box_creation is None:
+        box_creation = calculate_box_creation(stats)
     return (((stats['AST']/stats['GP']) - (0.38 * box_creation)) * 0.75) + (stats['FGA']/stats['GP']) + (stats['FTA']/stats['GP']) * 0.44 + box_creation + (stats['TOV']/stats['GP'])
 
 def calculate_shooting_proficiency(stats):
@@ -127,13 +323,19 @@ def calculate_shooting_proficiency(stats):
     """
     return (2 / (1 + np.exp(-stats['3PAper100']))) * stats['3P%']
 
-def calculate_spacing(stats):
+def calculate_spacing(stats, league_efg=None, season=CURRENT_SEASON):
     """
     Calculates Spacing.
 
     Spacing = (3PA * (3P% * 1.5)) - League Average eFG%
+
+    Args:
+        stats (dict or pd.DataFrame): Player stats.
+        league_efg (float): Optional league eFG%. Looked up for `season` if not given.
+        season (str): The NBA season the stats are from. Defaults to the current season.
     """
-    league_efg = get_league_efg()  # Get eFG from config.py
+    if league_efg is None:
+        league_efg = get_league_efg(season)  # Lazily fetched league context; never another season's
 
     if league_efg is None:
         print("Warning: League eFG% not available. Using 0 for spacing calculation.")
@@ -152,12 +354,20 @@ def calculate_clutch_ts_percentage(stats):
     clutch_pts = stats['Clutch_PTS']
     clutch_fga = stats['Clutch_FGA']
     clutch_fta = stats['Clutch_FTA']
+    denominator = clutch_fga + 0.44 * clutch_fta
+
+    if np.ndim(denominator) == 0:
+        # Handle cases where FGA or FTA are zero to avoid division by zero
+        if denominator == 0:
+            return 0
 
-    # Handle cases where FGA or FTA are zero to avoid division by zero
-    if clutch_fga + 0.44 * clutch_fta == 0:
-        return 0
+        ts_percentage = 0.5 * clutch_pts / denominator
+        return ts_percentage
 
-    ts_percentage = 0.5 * clutch_pts / (clutch_fga + 0.44 * clutch_fta)
+    # Column-wise: players with no clutch attempts get 0, like the scalar case
+    denominator = np.asarray(denominator, dtype=np.float64)
+    ts_percentage = np.zeros(denominator.shape)
+    np.divide(0.5 * np.asarray(clutch_pts, dtype=np.float64), denominator, out=ts_percentage, where=(denominator != 0))
     return ts_percentage
     
 def calculate_clutch(stats):
@@ -174,26 +384,44 @@ def calculate_clutch(stats):
 
     return clutch_stat
 
-def calculate_advanced_stats(player_stats):
-    player_data = []
-
-    for player, stats in player_stats.items():
-        player_record = {}
-        player_record['name'] = player
-        player_record.update(stats)
-        
-        try:
-            player_record['Offensive_Load'] = calculate_offensive_load(stats)
-            player_record['Box_Creation'] = calculate_box_creation(stats)
-            player_record['Shooting_Proficiency'] = calculate_shooting_proficiency(stats)
-            player_record['Spacing'] = calculate_spacing(stats)
-            player_record['Clutch'] = calculate_clutch(stats)
-        except Exception as e:
-            print(f"Error calculating advanced stats for {player}: {e}")
-            continue
-        
-        player_data.append(player_record)
-
-    df = pd.DataFrame(player_data)
+def calculate_advanced_stats(player_stats, season=CURRENT_SEASON):
+    """
+    Calculates the derived MODA objectives for every player.
+
+    All objectives are computed as column expressions over the whole player table
+    in one pass; Shooting Proficiency and Box Creation are each computed once and
+    reused by the objectives that depend on them.
+
+    Args:
+        player_stats (PlayerStore, dict or pd.DataFrame): Player data as returned by fetch_player_data,
+                                                          the equivalent {name: {stat: value}} dictionary,
+                                                          or a DataFrame with one row per player and a 'name' column.
+        season (str): The NBA season the data is from, for league constants. Defaults to the current season.
+
+    Returns:
+        pd.DataFrame: One row per player with a 'name' column, the raw stats and the derived objectives.
+    """
+    if isinstance(player_stats, pd.DataFrame):
+        df = player_stats.copy()
+    else:
+        if isinstance(player_stats, dict):
+            player_stats = PlayerStore.from_records(player_stats)
+        # A new frame around the store's matrix; the stat columns are not copied
+        df = player_stats.to_frame()
+
+    if df.empty:
+        return pd.DataFrame()
+
+    league_efg = get_league_efg(season)
+
+    with stage('Advanced stats'):
+        shooting_proficiency = calculate_shooting_proficiency(df)
+        box_creation = calculate_box_creation(df, shooting_proficiency)
+
+        df['Offensive_Load'] = calculate_offensive_load(df, box_creation)
+        df['Box_Creation'] = box_creation
+        df['Shooting_Proficiency'] = shooting_proficiency
+        df['Spacing'] = calculate_spacing(df, league_efg, season)
+        df['Clutch'] = calculate_clutch(df)
 
     return df
\ No newline at end of file
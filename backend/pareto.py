@@ -0,0 +1,123 @@
+import numpy as np
+from .moda import DEFAULT_WEIGHTS
+
+# --- Skyline Defaults ---
+# Candidates compared against the skyline per step
+SKYLINE_BLOCK_SIZE = 256
+
+# Upper bound on the number of row pairs compared at once
+SKYLINE_CHUNK_ELEMENTS = 4_000_000
+
+def skyline(matrix, epsilon=0.0, block_size=SKYLINE_BLOCK_SIZE):
+    """
+    Finds the Pareto-efficient rows of a matrix where every column is to be maximized.
+
+    A row b is dominated by a row a if a is at least as good on every column and
+    strictly better on at least one. With an epsilon tolerance, a only needs to be
+    within epsilon of b on every column (a >= b - epsilon) and strictly better on one,
+    so near-dominated rows are pruned as well.
+
+    Uses sort-filter-skyline: rows are visited by descending row sum, so a row can
+    only be dominated by rows visited before it, and each block of candidates is
+    compared against the skyline found so far with array operations. Every pruned
+    row is (epsilon-)dominated by a kept row.
+
+    Args:
+        matrix (np.ndarray): 2-D array (rows x columns) of values, higher is better.
+        epsilon (float): Tolerance on every column. Defaults to 0 (exact dominance).
+        block_size (int): Candidates compared per step. Defaults to SKYLINE_BLOCK_SIZE.
+
+    Returns:
+        np.ndarray: Indices of the skyline rows, in ascending order.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if epsilon < 0:
+        raise ValueError("Epsilon must be non-negative.")
+    if len(matrix) == 0 or matrix.shape[1] == 0:
+        return np.arange(len(matrix))
+
+    order = np.argsort(-matrix.sum(axis=1), kind='stable')
+    sorted_matrix = matrix[order]
+
+    # Skyline rows found so far, in visiting order
+    kept = np.empty(len(matrix), dtype=np.int64)
+    n_kept = 0
+
+    for start in range(0, len(matrix), block_size):
+        block = sorted_matrix[start:start + block_size]
+
+        # Against the skyline so far
+        survivors = ~_dominated_by_any(sorted_matrix[kept[:n_kept]], block, epsilon)
+
+        # Within the block, against earlier survivors only
+        candidates = np.flatnonzero(survivors)
+        dominates = _dominance(block[candidates], block[candidates], epsilon)
+        dominates &= np.triu(np.ones((len(candidates), len(candidates)), dtype=bool), k=1)
+        if epsilon == 0:
+            # Exact dominance is transitive, so any earlier dominator rules a candidate out
+            inside = ~dominates.any(axis=0)
+        else:
+            inside = np.ones(len(candidates), dtype=bool)
+            for j in range(1, len(candidates)):
+                inside[j] = not dominates[:j, j][inside[:j]].any()
+
+        new = start + candidates[inside]
+        kept[n_kept:n_kept + len(new)] = new
+        n_kept += len(new)
+
+    return np.sort(order[kept[:n_kept]])
+
+def _dominance(a, b, epsilon):
+    # dominates[i, j]: row a[i] dominates row b[j]; built one column at a time on 2-D arrays
+    at_least = np.ones((len(a), len(b)), dtype=bool)
+    better = np.zeros((len(a), len(b)), dtype=bool)
+    for column in range(a.shape[1]):
+        a_column, b_column = a[:, column, None], b[None, :, column]
+        at_least &= a_column >= b_column - epsilon
+        better |= a_column > b_column
+    return at_least & better
+
+def _dominated_by_any(skyline_rows, block, epsilon):
+    # Chunked over the skyline so the pairwise comparison stays within SKYLINE_CHUNK_ELEMENTS
+    dominated = np.zeros(len(block), dtype=bool)
+    chunk_size = max(1, SKYLINE_CHUNK_ELEMENTS // max(1, len(block)))
+    for start in range(0, len(skyline_rows), chunk_size):
+        dominated |= _dominance(skyline_rows[start:start + chunk_size], block, epsilon).any(axis=0)
+        if dominated.all():
+            break
+    return dominated
+
+def pareto_front(dataset, weights=None, epsilon=0.0):
+    """
+    Finds the players of a ScoringDataset that are not dominated on the weighted objectives.
+
+    Only objectives with a positive weight are compared: a player dominated on all
+    of them can never rank first under any weights with the same active objectives.
+
+    Args:
+        dataset (ScoringDataset): The dataset.
+        weights (dict): Weights selecting the objectives to compare. Defaults to DEFAULT_WEIGHTS.
+        epsilon (float): Tolerance on the 0-100 scale, see skyline. Defaults to 0.
+
+    Returns:
+        np.ndarray: Row indices of the Pareto-efficient players, in dataset order.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+
+    active = dataset.weight_vector(weights) > 0
+    return skyline(dataset.scaled[:, active], epsilon)
+
+def reduce_to_pareto_front(dataset, weights=None, epsilon=0.0):
+    """
+    Prunes a ScoringDataset down to its Pareto-efficient players.
+
+    Args:
+        dataset (ScoringDataset): The dataset.
+        weights (dict): Weights selecting the objectives to compare. Defaults to DEFAULT_WEIGHTS.
+        epsilon (float): Tolerance on the 0-100 scale, see skyline. Defaults to 0.
+
+    Returns:
+        ScoringDataset: The reduced dataset (see ScoringDataset.subset).
+    """
+    return dataset.subset(pareto_front(dataset, weights, epsilon))
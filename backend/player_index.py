@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from .config import get_cache_dir
+from .instrumentation import record_cache_lookup
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+def player_index_path():
+    """
+    Returns the path of the on-disk player index.
+
+    Returns:
+        str: Path to the player index JSON file. PLAYER_IDs and Basketball Reference
+             IDs never change, so one index serves every season.
+    """
+    return os.path.join(get_cache_dir(), "player_index.json")
+
+@contextmanager
+def _file_lock(path):
+    # Exclusive lock on a side file, held across processes (e.g. the season workers of backend.history)
+    with open(path, 'a+') as f:
+        f.seek(0)
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about ten seconds; keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            f.seek(0)
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class PlayerIndex:
+    """
+    Persistent PLAYER_ID -> Basketball Reference ID (slug) and display name index.
+
+    Display names come from the league-wide NBA API stats, so no per-player call
+    is needed to get them. Slugs are learned in bulk whenever the season-wide
+    Basketball Reference table is matched, so player pages are requested by
+    their real ID (e.g. 'jacksja02') instead of one guessed from the name.
+
+    Several processes may share the index, so saving merges this instance's
+    updates into the index on disk under a file lock instead of overwriting it.
+
+    Attributes:
+        entries (dict): PLAYER_ID -> {'name': str, 'slug': str or None}.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}
+        # PLAYER_ID -> fields changed since the index was loaded or last saved
+        self._updates = {}
+
+    @classmethod
+    def load(cls):
+        """
+        Loads the index from disk.
+
+        Returns:
+            PlayerIndex: The stored index, or an empty one if missing or unreadable.
+        """
+        entries = _read_entries(player_index_path())
+        record_cache_lookup('player_index', hit=entries is not None)
+        return cls(entries)
+
+    def save(self):
+        """
+        Merges the updates made since the index was loaded into the index on disk.
+
+        The file is re-read under a lock and only the changed fields are written
+        over it, so entries saved meanwhile by other processes are kept.
+
+        Returns:
+            str: Path to the written index, or None if there was nothing to save.
+        """
+        if not self._updates:
+            return None
+
+        path = player_index_path()
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        with _file_lock(path + '.lock'):
+            entries = _read_entries(path) or {}
+            for player_id, fields in self._updates.items():
+                entries.setdefault(player_id, {'name': None, 'slug': None}).update(fields)
+
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({str(player_id): entry for player_id, entry in entries.items()}, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        self.entries = entries
+        self._updates = {}
+        return path
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, player_id):
+        return int(player_id) in self.entries
+
+    def name(self, player_id):
+        """Returns a player's display name, or None if unknown."""
+        return self.entries.get(int(player_id), {}).get('name')
+
+    def slug(self, player_id):
+        """Returns a player's Basketball Reference ID, or None if unknown."""
+        return self.entries.get(int(player_id), {}).get('slug')
+
+    def slugs(self, player_ids):
+        """
+        Looks up the Basketball Reference IDs of many players.
+
+        Args:
+            player_ids (iterable): PLAYER_IDs to look up.
+
+        Returns:
+            dict: PLAYER_ID -> slug for every player whose slug is known.
+        """
+        slugs = {}
+        for player_id in player_ids:
+            slug = self.slug(player_id)
+            if slug is not None:
+                slugs[player_id] = slug
+        return slugs
+
+    def update_names(self, player_names):
+        """
+        Records display names in bulk.
+
+        Args:
+            player_names (pd.Series or dict): Display names keyed by PLAYER_ID.
+        """
+        for player_id, name in player_names.items():
+            entry = self.entries.setdefault(int(player_id), {'name': None, 'slug': None})
+            if entry['name'] != name:
+                entry['name'] = name
+                self._updates.setdefault(int(player_id), {})['name'] = name
+
+    def update_slugs(self, slugs):
+        """
+        Records Basketball Reference IDs in bulk.
+
+        Args:
+            slugs (pd.Series or dict): Slugs keyed by PLAYER_ID.
+        """
+        for player_id, slug in slugs.items():
+            entry = self.entries.setdefault(int(player_id), {'name': None, 'slug': None})
+            if entry['slug'] != slug:
+                entry['slug'] = slug
+                self._updates.setdefault(int(player_id), {})['slug'] = slug
+
+def _read_entries(path):
+    # Stored entries keyed by PLAYER_ID, or None if the index is missing or unreadable
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path) as f:
+            return {int(player_id): entry for player_id, entry in json.load(f).items()}
+    except Exception as e:
+        print(f"Warning: Could not read player index: {e}")
+        return None
@@ -0,0 +1,99 @@
+import numpy as np
+from .moda import DEFAULT_WEIGHTS
+from .utils import top_k_order
+
+# --- Ranking Engine Defaults ---
+# Rank-one updates accumulate floating-point error; scores are recomputed in full after this many
+RESYNC_UPDATES = 256
+
+class RankingEngine:
+    """
+    Keeps the MVP scores of a ScoringDataset up to date as the weights change.
+
+    Changing one objective's weight by dw moves every score by dw times that
+    objective's column, so a slider move costs one O(n) vector update instead of
+    a full matrix-vector product. Leaders are read with top_k, which selects
+    rather than sorts.
+    """
+
+    def __init__(self, dataset, weights=None):
+        self.dataset = dataset
+        self.set_weights(weights if weights is not None else DEFAULT_WEIGHTS, full=True)
+
+    def set_weights(self, weights, full=False):
+        """
+        Moves to a new set of weights.
+
+        Only objectives whose weight changed are applied, each as a rank-one update.
+        When most weights changed, the scores are recomputed in full instead.
+
+        Args:
+            weights (dict): Dictionary of weights for each objective.
+            full (bool): If True, always recomputes the scores in full. Defaults to False.
+        """
+        vector = self.dataset.weight_vector(weights)
+
+        if not full:
+            changed = np.flatnonzero(vector != self.weights)
+            full = len(changed) > len(vector) // 2 or self._updates + len(changed) > RESYNC_UPDATES
+
+        if full:
+            self.weights = vector
+            self.scores = self.dataset.scaled @ vector
+            self._updates = 0
+            return
+
+        for j in changed:
+            self._apply(j, vector[j])
+
+    def set_weight(self, objective, weight):
+        """
+        Changes the weight of a single objective with a rank-one update.
+
+        Args:
+            objective (str): Objective name. Objectives not in the dataset are ignored.
+            weight (float): New weight.
+        """
+        if objective not in self.dataset.objectives:
+            return
+        j = self.dataset.objectives.index(objective)
+        if weight == self.weights[j]:
+            return
+
+        if self._updates >= RESYNC_UPDATES:
+            self.weights[j] = weight
+            self.scores = self.dataset.scaled @ self.weights
+            self._updates = 0
+            return
+
+        self._apply(j, weight)
+
+    def _apply(self, j, weight):
+        # scores += dw * column, in place
+        self.scores += (weight - self.weights[j]) * self.dataset.scaled[:, j]
+        self.weights[j] = weight
+        self._updates += 1
+
+    def top_k(self, k):
+        """
+        Returns the current leaders.
+
+        Args:
+            k (int): Number of leaders to return.
+
+        Returns:
+            tuple: (indices, scores) of the k highest-scoring players, highest first.
+        """
+        order = top_k_order(self.scores, k)
+        return order, self.scores[order]
+
+    def ranks(self):
+        """
+        Returns the current rank of every player.
+
+        Returns:
+            np.ndarray: Rank of each player (1 is the highest score), in dataset order.
+        """
+        ranks = np.empty(len(self.scores), dtype=np.int64)
+        ranks[np.argsort(-self.scores, kind='stable')] = np.arange(1, len(self.scores) + 1)
+        return ranks
@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from .instrumentation import record_request, record_retry, url_host
+
+# --- Scraper Defaults ---
+BBREF_BASE_URL = 'https://www.basketball-reference.com'
+
+# Basketball Reference allows roughly 20 requests per minute before it starts blocking
+BBREF_REQUESTS_PER_MINUTE = 20
+
+MAX_WORKERS = 4
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2.0
+REQUEST_TIMEOUT = 10
+
+# Status codes worth retrying: rate limited or a transient server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+USER_AGENT = 'Mozilla/5.0 (compatible; NBA_MODA/1.0)'
+
+class RateLimiter:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added continuously at `rate` per second up to `capacity`; every
+    request takes one token and blocks until one is available. Shared by all
+    workers, so the combined request rate never exceeds `rate`.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute, capacity=1):
+        """Creates a rate limiter allowing `requests_per_minute` requests per minute."""
+        return cls(requests_per_minute / 60, capacity)
+
+    def acquire(self):
+        """Blocks until a token is available, then takes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+def create_session(pool_size=MAX_WORKERS):
+    """
+    Creates a pooled HTTP session reused across every scrape.
+
+    Args:
+        pool_size (int): Number of connections kept alive per host. Defaults to MAX_WORKERS.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def get_with_retry(session, url, rate_limiter=None, max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, timeout=REQUEST_TIMEOUT):
+    """
+    Sends a GET request, retrying with exponential backoff on 429/5xx responses and connection errors.
+
+    A Retry-After header on the response takes precedence over the computed backoff.
+
+    Args:
+        session (requests.Session): Session to send the request with.
+        url (str): URL to fetch.
+        rate_limiter (RateLimiter): Optional limiter; a token is taken before every attempt.
+        max_retries (int): Number of retries after the first attempt. Defaults to MAX_RETRIES.
+        backoff (float): Base backoff in seconds, doubled after every retry. Defaults to BACKOFF_SECONDS.
+        timeout (float): Per-request timeout in seconds. Defaults to REQUEST_TIMEOUT.
+
+    Returns:
+        requests.Response: The last response received.
+    """
+    host = url_host(url)
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        start = time.perf_counter()
+        try:
+            response = session.get(url, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            record_request(host, time.perf_counter() - start)
+            if attempt == max_retries:
+                raise
+            record_retry(host)
+            time.sleep(backoff * 2 ** attempt)
+            continue
+        record_request(host, time.perf_counter() - start, response.status_code)
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+            return response
+
+        record_retry(host)
+        time.sleep(_retry_delay(response, backoff * 2 ** attempt))
+
+    return response
+
+def _retry_delay(response, default):
+    """Returns the Retry-After delay of a response in seconds, or `default` if absent."""
+    retry_after = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return default
+
+def scrape_concurrently(items, scrape, max_workers=MAX_WORKERS, progress=None, on_result=None):
+    """
+    Runs `scrape(item)` for every item on a bounded worker pool.
+
+    Failures do not stop the run: results are returned for whatever succeeded
+    and errors are collected separately.
+
+    Args:
+        items (iterable): Items to scrape (e.g., player names).
+        scrape (callable): Function taking one item and returning its result.
+        max_workers (int): Number of worker threads. Defaults to MAX_WORKERS.
+        progress (callable): Optional callback, called as progress(done, total) after
+                             every item. If it raises, pending items are cancelled
+                             and the exception is propagated.
+        on_result (callable): Optional callback, called as on_result(item, result, error)
+                              as every item finishes, in the calling thread; error is
+                              None on success.
+
+    Returns:
+        tuple: (results, errors), dictionaries keyed by item holding the result
+               or the exception raised for that item.
+    """
+    results = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(scrape, item): item for item in items}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                item = futures[future]
+                try:
+                    results[item] = future.result()
+                except Exception as e:
+                    errors[item] = e
+
+                if on_result is not None:
+                    on_result(item, results.get(item), errors.get(item))
+
+                if progress is not None:
+                    progress(done, len(futures))
+        except BaseException:
+            # Don't start anything new; only in-flight requests are waited for
+            for future in futures:
+                future.cancel()
+            raise
+
+    return results, errors
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from .moda import DEFAULT_WEIGHTS
+
+# --- Sensitivity Defaults ---
+# Upper bound on the number of scores held in memory per chunk (samples x players)
+CHUNK_ELEMENTS = 4_000_000
+
+# Number of leading ranks tracked per player in the rank distribution
+MAX_TRACKED_RANK = 50
+
+# Weight range of the GUI sliders, used as the tipping-point search range
+MAX_WEIGHT = 100
+
+def sample_weights(dataset, n_samples, base_weights=None, method='dirichlet', concentration=50, seed=None):
+    """
+    Samples weight vectors around (or independently of) a set of swing weights.
+
+    Only objectives with a positive base weight are varied; the others stay at 0.
+    Every sample is scaled to the same total as the base weights, so scores stay
+    comparable to the base ranking.
+
+    Args:
+        dataset (ScoringDataset): Dataset whose objective columns the samples align with.
+        n_samples (int): Number of weight vectors to draw.
+        base_weights (dict): Swing weights to sample around. Defaults to DEFAULT_WEIGHTS.
+        method (str): 'dirichlet' samples around the base weights, with `concentration`
+                      controlling how tightly; 'uniform' samples uniformly over all
+                      weightings of the active objectives. Defaults to 'dirichlet'.
+        concentration (float): Dirichlet concentration; higher stays closer to the base weights.
+        seed (int): Optional random seed.
+
+    Returns:
+        np.ndarray: 2-D array (samples x objectives) of weights.
+    """
+    if base_weights is None:
+        base_weights = DEFAULT_WEIGHTS
+
+    base = dataset.weight_vector(base_weights)
+    active = base > 0
+    total = base.sum()
+    rng = np.random.default_rng(seed)
+
+    if method == 'dirichlet':
+        alpha = concentration * base[active] / total
+    elif method == 'uniform':
+        alpha = np.ones(active.sum())
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+
+    samples = np.zeros((n_samples, len(base)))
+    samples[:, active] = rng.dirichlet(alpha, size=n_samples) * total
+    return samples
+
+def sweep_weights(dataset, objective, values, base_weights=None):
+    """
+    Builds weight vectors that vary a single objective's weight over a range of values.
+
+    Args:
+        dataset (ScoringDataset): Dataset whose objective columns the weights align with.
+        objective (str): Objective whose weight is swept.
+        values (array-like): Weights to try for `objective`.
+        base_weights (dict): Weights for every other objective. Defaults to DEFAULT_WEIGHTS.
+
+    Returns:
+        np.ndarray: 2-D array (len(values) x objectives) of weights.
+    """
+    if base_weights is None:
+        base_weights = DEFAULT_WEIGHTS
+
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.tile(dataset.weight_vector(base_weights), (len(values), 1))
+    weights[:, dataset.objectives.index(objective)] = values
+    return weights
+
+def rank_counts(dataset, weight_samples, max_rank=MAX_TRACKED_RANK, chunk_size=None):
+    """
+    Scores every weight vector against the dataset and tallies where each player finishes.
+
+    Samples are scored in chunks as a single matrix product per chunk, so memory
+    stays bounded by CHUNK_ELEMENTS no matter how many samples are given.
+
+    Args:
+        dataset (ScoringDataset): Dataset to score.
+        weight_samples (np.ndarray): 2-D array (samples x objectives) of weights.
+        max_rank (int): Number of leading ranks to tally. Defaults to MAX_TRACKED_RANK.
+        chunk_size (int): Samples per chunk. Derived from CHUNK_ELEMENTS if not given.
+
+    Returns:
+        tuple: (counts, rank_sums), where counts[i, r] is how often player i finished
+               at rank r + 1 (for r < max_rank) and rank_sums[i] is the sum of player
+               i's ranks over all samples.
+    """
+    weight_samples = np.atleast_2d(np.asarray(weight_samples, dtype=np.float64))
+    n_players = len(dataset)
+    max_rank = min(max_rank, n_players)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(n_players, 1))
+
+    counts = np.zeros(n_players * max_rank, dtype=np.int64)
+    rank_sums = np.zeros(n_players, dtype=np.int64)
+    scaled_t = dataset.scaled.T
+
+    for start in range(0, len(weight_samples), chunk_size):
+        scores = weight_samples[start:start + chunk_size] @ scaled_t
+        order = np.argsort(-scores, axis=1)
+
+        # order[:, r] is the player finishing at rank r + 1
+        leaders = order[:, :max_rank]
+        counts += np.bincount(
+            (leaders * max_rank + np.arange(max_rank)).ravel(), minlength=n_players * max_rank
+        )
+
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, n_players + 1), axis=1)
+        rank_sums += ranks.sum(axis=0)
+
+    return counts.reshape(n_players, max_rank), rank_sums
+
+def rank_stability(dataset, weight_samples, max_rank=MAX_TRACKED_RANK, chunk_size=None):
+    """
+    Summarizes how stable each player's ranking is across many weight vectors.
+
+    Args:
+        dataset (ScoringDataset): Dataset to score.
+        weight_samples (np.ndarray): 2-D array (samples x objectives) of weights,
+                                     e.g. from sample_weights or sweep_weights.
+        max_rank (int): Number of leading ranks to tally. Defaults to MAX_TRACKED_RANK.
+        chunk_size (int): Samples per chunk. Derived from CHUNK_ELEMENTS if not given.
+
+    Returns:
+        pd.DataFrame: One row per player, sorted by probability of finishing first, with
+                      'P(1st)', 'P(Top 5)', 'Mean Rank', 'Best Rank' and one
+                      'Rank <r>' column per tracked rank holding its probability.
+    """
+    counts, rank_sums = rank_counts(dataset, weight_samples, max_rank, chunk_size)
+    n_samples = len(np.atleast_2d(weight_samples))
+    probabilities = counts / n_samples
+
+    # Best tracked rank, or NaN for players never finishing inside it
+    finished = counts > 0
+    best_rank = np.where(finished.any(axis=1), finished.argmax(axis=1) + 1, np.nan)
+
+    summary = pd.DataFrame({
+        'name': dataset.names,
+        'P(1st)': probabilities[:, 0],
+        'P(Top 5)': probabilities[:, :5].sum(axis=1),
+        'Mean Rank': rank_sums / n_samples,
+        'Best Rank': best_rank
+    })
+    distribution = pd.DataFrame(probabilities, columns=[f"Rank {r + 1}" for r in range(counts.shape[1])])
+    summary = pd.concat([summary, distribution], axis=1)
+
+    return summary.sort_values(by=['P(1st)', 'Mean Rank'], ascending=[False, True], ignore_index=True)
+
+def tipping_points(dataset, weights=None, objectives=None, max_weight=MAX_WEIGHT):
+    """
+    Finds, for each objective, the exact weights at which the #1 player changes.
+
+    With every other weight held fixed, each player's score is a straight line in
+    the weight of one objective, so the leader only changes where the current
+    leader's line is overtaken. The crossings are found exactly by walking the
+    upper envelope of those lines from 0 to `max_weight`.
+
+    Args:
+        dataset (ScoringDataset): Dataset to score.
+        weights (dict): Current weights. Defaults to DEFAULT_WEIGHTS.
+        objectives (list): Objectives to analyze. Defaults to every objective in the dataset.
+        max_weight (float): Upper end of the weight range searched. Defaults to MAX_WEIGHT.
+
+    Returns:
+        pd.DataFrame: One row per leadership change with 'objective', 'current_weight',
+                      'weight' (where the change happens), 'leader_before' and 'leader_after'.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    if objectives is None:
+        objectives = dataset.objectives
+
+    base = dataset.weight_vector(weights)
+    base_scores = dataset.scaled @ base
+    rows = []
+
+    for objective in objectives:
+        j = dataset.objectives.index(objective)
+
+        # score_i(t) = intercept_i + t * slope_i, where t is the objective's weight
+        slope = dataset.scaled[:, j]
+        intercept = base_scores - base[j] * slope
+
+        # Leader at t = 0; ties go to the steeper line, which leads just after 0
+        leader = np.lexsort((slope, intercept))[-1]
+        t = 0.0
+
+        while True:
+            steeper = slope > slope[leader]
+            if not steeper.any():
+                break
+
+            crossings = np.full(len(slope), np.inf)
+            crossings[steeper] = (intercept[leader] - intercept[steeper]) / (slope[steeper] - slope[leader])
+            crossings[crossings < t] = np.inf
+
+            t_next = crossings.min()
+            if t_next > max_weight:
+                break
+
+            # Among simultaneous crossings the steepest line leads afterwards
+            candidates = np.flatnonzero(crossings == t_next)
+            new_leader = candidates[np.argmax(slope[candidates])]
+
+            rows.append({
+                'objective': objective,
+                'current_weight': base[j],
+                'weight': t_next,
+                'leader_before': dataset.names[leader],
+                'leader_after': dataset.names[new_leader]
+            })
+            leader, t = new_leader, t_next
+
+    return pd.DataFrame(rows, columns=['objective', 'current_weight', 'weight', 'leader_before', 'leader_after'])
@@ -0,0 +1,415 @@
+"""
+Headless HTTP/JSON ranking service.
+
+Keeps a prepared ScoringDataset in memory and answers ranking queries for any
+weights, return-to-scale degrees and value functions, without the PyQt6 app. Run it with
+
+    python -m backend.service --season 2024-25 --port 8765
+
+Endpoints:
+    GET  /health       Dataset version, player count and cache statistics.
+    GET  /objectives   Objective names with the default weights, degrees and value functions.
+    GET  /rankings     Rankings; optional query parameters 'weights', 'degrees' and
+                       'value_functions' (JSON objects) and 'limit'.
+    POST /rankings     Same, with a JSON body
+                       {"weights": {...}, "degrees": {...}, "value_functions": {...}, "limit": n}.
+
+Value functions are given in their JSON form per objective, e.g.
+{"DBPM": {"kind": "s_curve", "direction": "increasing", "ideal": 8, "anti_ideal": -2}}.
+"""
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from .cache import load_snapshot, load_league_context
+from .config import CURRENT_SEASON
+from .data_fetcher import fetch_player_data
+from .league import set_league_context
+from .moda import DEFAULT_WEIGHTS, POLYNOMIAL_DEGREES, prepare_scoring_dataset, resolve_value_functions, scale_objectives
+
+# --- Service Defaults ---
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Rankings memoized per (dataset version, value functions, normalized weights)
+RANKING_CACHE_SIZE = 1024
+
+# Re-scaled objective matrices kept per non-default set of value functions
+SCALED_CACHE_SIZE = 8
+
+# Normalized weights are rounded to this many decimals to form cache keys
+WEIGHT_KEY_DECIMALS = 12
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit and miss counters."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached value for `key`, or None."""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        """Returns the cache size and hit/miss counts."""
+        with self._lock:
+            return {'size': len(self._items), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+class RankingService:
+    """
+    Answers ranking queries against one in-memory ScoringDataset.
+
+    Rankings only depend on the direction of the weight vector: scaling every
+    weight by c scales every score by c. Weights are therefore normalized to sum
+    to 1 before the cache lookup, so proportional weight sets share one entry,
+    and the cached scores are scaled back to the requested weights on the way out.
+    """
+
+    def __init__(self, dataset, season=None):
+        self.dataset = dataset
+        self.season = season
+        self.version = dataset_version(dataset)
+        self.rankings = LRUCache(RANKING_CACHE_SIZE)
+        self.scaled_matrices = LRUCache(SCALED_CACHE_SIZE)
+        self._default_degrees = self.degree_key(None)
+        self._default_functions = self.function_key(None, None)
+
+    @classmethod
+    def from_snapshot(cls, season=CURRENT_SEASON, offline=True):
+        """
+        Builds the service from a season's cached data.
+
+        Args:
+            season (str): The NBA season (e.g., '2024-25').
+            offline (bool): If True, uses the on-disk snapshot regardless of its age and
+                            never touches the network. If False, fetches when the snapshot
+                            is missing or stale. Defaults to True.
+
+        Returns:
+            RankingService: The service, or None if no data is available.
+        """
+        if offline:
+            player_stats = load_snapshot(season, ttl_hours=float('inf'))
+            if load_league_context(season) is None:
+                print(f"Warning: No cached league context for {season}. Using 0 for league eFG%.")
+                set_league_context(season, {'efg': None}, persist=False)
+        else:
+            player_stats = fetch_player_data(season)
+
+        if not player_stats:
+            return None
+
+        return cls(prepare_scoring_dataset(player_stats, season), season)
+
+    def weight_key(self, weights):
+        """
+        Normalizes a weights dictionary for caching.
+
+        Args:
+            weights (dict): Weight per objective; objectives not given are 0.
+
+        Returns:
+            tuple: (key, total), where key holds the weights divided by their total,
+                   one per objective column, and total is the sum of the weights.
+
+        Raises:
+            ValueError: If an objective is unknown, a weight is negative or not a number,
+                        or the weights add up to more than a float can hold.
+        """
+        unknown = set(weights) - set(self.dataset.objectives)
+        if unknown:
+            raise ValueError(f"Unknown objectives: {sorted(unknown)}")
+
+        try:
+            vector = self.dataset.weight_vector({name: float(value) for name, value in weights.items()})
+        except (TypeError, ValueError):
+            raise ValueError("Weights must be numbers.")
+        if not np.isfinite(vector).all() or (vector < 0).any():
+            raise ValueError("Weights must be finite and non-negative.")
+
+        with np.errstate(over='ignore'):
+            total = float(vector.sum())
+        if not np.isfinite(total):
+            raise ValueError("Weights must add up to a finite number.")
+        if total > 0:
+            vector = vector / total
+        return tuple(np.round(vector, WEIGHT_KEY_DECIMALS).tolist()), total
+
+    def degree_key(self, degrees):
+        """
+        Resolves the return-to-scale degree of every objective column.
+
+        Args:
+            degrees (dict): Optional degree per objective; others use POLYNOMIAL_DEGREES.
+
+        Returns:
+            tuple: Degree per objective column.
+
+        Raises:
+            ValueError: If an objective is unknown or a degree is not a positive integer.
+        """
+        degrees = degrees or {}
+        unknown = set(degrees) - set(self.dataset.objectives)
+        if unknown:
+            raise ValueError(f"Unknown objectives: {sorted(unknown)}")
+
+        key = []
+        for name in self.dataset.objectives:
+            degree = degrees.get(name, POLYNOMIAL_DEGREES.get(name, 1))
+            if isinstance(degree, bool) or not isinstance(degree, int) or degree < 1:
+                raise ValueError(f"Degree for {name} must be a positive integer.")
+            key.append(degree)
+        return tuple(key)
+
+    def function_key(self, degrees, value_functions):
+        """
+        Resolves the value function of every objective column.
+
+        Args:
+            degrees (dict): Optional degree per objective; others use POLYNOMIAL_DEGREES.
+            value_functions (dict): Optional value function (JSON form) per objective;
+                                    takes precedence over `degrees`.
+
+        Returns:
+            tuple: ValueFunction per objective column.
+
+        Raises:
+            ValueError: If an objective is unknown or a degree or value function is invalid.
+        """
+        degrees = dict(zip(self.dataset.objectives, self.degree_key(degrees)))
+        value_functions = value_functions or {}
+        unknown = set(value_functions) - set(self.dataset.objectives)
+        if unknown:
+            raise ValueError(f"Unknown objectives: {sorted(unknown)}")
+        return tuple(resolve_value_functions(self.dataset.objectives, degrees, value_functions))
+
+    def scaled_matrix(self, function_key):
+        """
+        Returns the objective matrix returned to scale with the given value functions.
+
+        Raises:
+            ValueError: If a value function scales any player to a value that is not finite.
+        """
+        if function_key == self._default_functions:
+            return self.dataset.scaled
+
+        scaled = self.scaled_matrices.get(function_key)
+        if scaled is None:
+            with np.errstate(all='ignore'):
+                _, scaled, _ = scale_objectives(self.dataset.stats, value_functions=dict(zip(self.dataset.objectives, function_key)))
+            # Checked once per matrix, so NaN never reaches a ranking, in the returned slice or not
+            invalid = ~np.isfinite(scaled).all(axis=0)
+            if invalid.any():
+                name, function = next((name, function) for name, function, bad in zip(self.dataset.objectives, function_key, invalid) if bad)
+                raise ValueError(f"The value function for {name} does not give finite values: {function}")
+            self.scaled_matrices.put(function_key, scaled)
+        return scaled
+
+    def rank(self, weights=None, degrees=None, limit=None, value_functions=None):
+        """
+        Ranks the players for a set of weights and value functions.
+
+        Args:
+            weights (dict): Weight per objective. Defaults to DEFAULT_WEIGHTS.
+            degrees (dict): Optional degree per objective. Defaults to POLYNOMIAL_DEGREES.
+            limit (int): Optional number of leading players to return.
+            value_functions (dict): Optional value function (JSON form) per objective.
+                                    Defaults to DEFAULT_VALUE_FUNCTIONS.
+
+        Returns:
+            dict: 'version', 'season', 'cached' (whether the ranking was memoized) and
+                  'rankings', a list of {'rank', 'name', 'MVP Score'} from highest to lowest score.
+        """
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 0):
+            raise ValueError("Limit must be a non-negative integer.")
+
+        weight_key, total = self.weight_key(weights)
+        function_key = self.function_key(degrees, value_functions)
+        key = (self.version, function_key, weight_key)
+
+        cached = self.rankings.get(key)
+        if cached is None:
+            scores = self.scaled_matrix(function_key) @ np.asarray(weight_key)
+            order = np.argsort(-scores, kind='stable')
+            self.rankings.put(key, (order, scores))
+        else:
+            order, scores = cached
+
+        top = order[:limit]
+        with np.errstate(over='ignore'):
+            top_scores = scores[top] * total
+        if not np.isfinite(top_scores).all():
+            raise ValueError("Weights are too large to score with.")
+        top_scores = top_scores.tolist()
+        names = self.dataset.names[top].tolist()
+
+        return {
+            'version': self.version,
+            'season': self.season,
+            'cached': cached is not None,
+            'rankings': [
+                {'rank': i + 1, 'name': name, 'MVP Score': score}
+                for i, (name, score) in enumerate(zip(names, top_scores))
+            ]
+        }
+
+    def health(self):
+        """Returns the dataset version, player count and cache statistics."""
+        return {
+            'status': 'ok',
+            'version': self.version,
+            'season': self.season,
+            'players': len(self.dataset),
+            'ranking_cache': self.rankings.stats(),
+            'scaled_cache': self.scaled_matrices.stats()
+        }
+
+    def describe_objectives(self):
+        """Returns the objective names with their default weights, degrees and value functions."""
+        return {
+            'objectives': self.dataset.objectives,
+            'default_weights': {name: DEFAULT_WEIGHTS.get(name, 0) for name in self.dataset.objectives},
+            'default_degrees': dict(zip(self.dataset.objectives, self._default_degrees)),
+            'default_value_functions': {
+                name: function.to_dict() for name, function in zip(self.dataset.objectives, self._default_functions)
+            }
+        }
+
+def dataset_version(dataset):
+    """
+    Fingerprints a dataset, so cached rankings never outlive the data they were computed from.
+
+    Args:
+        dataset (ScoringDataset): The dataset.
+
+    Returns:
+        str: Short hex digest over the player names and the scaled matrix.
+    """
+    digest = hashlib.sha1()
+    digest.update('\0'.join(map(str, dataset.names)).encode())
+    digest.update(np.ascontiguousarray(dataset.scaled).tobytes())
+    return digest.hexdigest()[:12]
+
+class RankingRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the server's RankingService."""
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+
+        if url.path == '/health':
+            return self.send_json(200, service.health())
+        if url.path == '/objectives':
+            return self.send_json(200, service.describe_objectives())
+        if url.path != '/rankings':
+            return self.send_json(404, {'error': f"Unknown path: {url.path}"})
+
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            weights = json.loads(query['weights']) if 'weights' in query else None
+            degrees = json.loads(query['degrees']) if 'degrees' in query else None
+            value_functions = json.loads(query['value_functions']) if 'value_functions' in query else None
+            limit = int(query['limit']) if 'limit' in query else None
+        except ValueError as e:
+            return self.send_json(400, {'error': f"Invalid query parameter: {e}"})
+        self.send_ranking(weights, degrees, limit, value_functions)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/rankings':
+            return self.send_json(404, {'error': f"Unknown path: {self.path}"})
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            return self.send_json(400, {'error': f"Invalid JSON body: {e}"})
+        if not isinstance(body, dict):
+            return self.send_json(400, {'error': "The request body must be a JSON object."})
+
+        self.send_ranking(body.get('weights'), body.get('degrees'), body.get('limit'), body.get('value_functions'))
+
+    def send_ranking(self, weights, degrees, limit, value_functions=None):
+        if any(value is not None and not isinstance(value, dict) for value in (weights, degrees, value_functions)):
+            return self.send_json(400, {'error': "'weights', 'degrees' and 'value_functions' must be JSON objects."})
+        try:
+            result = self.server.service.rank(weights, degrees, limit, value_functions)
+        except ValueError as e:
+            return self.send_json(400, {'error': str(e)})
+        self.send_json(200, result)
+
+    def send_json(self, status, payload):
+        try:
+            # NaN and Infinity are not JSON; a payload holding them is a bug, never a response
+            body = json.dumps(payload, allow_nan=False).encode()
+        except ValueError as e:
+            status, body = 500, json.dumps({'error': f"Could not encode the response: {e}"}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class RankingServer(ThreadingHTTPServer):
+    """Threaded HTTP server; every request is handled on its own thread."""
+    daemon_threads = True
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+        super().__init__((host, port), RankingRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve NBA MVP rankings over HTTP/JSON.")
+    parser.add_argument('--season', default=CURRENT_SEASON, help="Season to serve (e.g., 2024-25).")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Interface to listen on.")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on.")
+    parser.add_argument('--online', action='store_true', help="Fetch the season if its snapshot is missing or stale.")
+    parser.add_argument('--verbose', action='store_true', help="Log every request.")
+    args = parser.parse_args(argv)
+
+    service = RankingService.from_snapshot(args.season, offline=not args.online)
+    if service is None:
+        print(f"Error: No cached data for the {args.season} season. Run once with --online to fetch it.")
+        return 1
+
+    server = RankingServer(service, args.host, args.port, args.verbose)
+    print(f"Serving {len(service.dataset)} players ({args.season}, version {service.version}) on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+# --- Player Store Schema ---
+# Order of the league-wide stats in each player's record
+STAT_COLUMNS = [
+    'Height', 'Weight', 'PTS', 'AST', 'TOV', '3PA', '3PAper100', '3P%', 'GP', 'MP', 'TmMP', 'FG', 'FGA', 'FTA',
+    'TS%', 'FT%', '+/-', 'Clutch_PTS', 'Clutch_FGA', 'Clutch_FTA', 'Clutch_+/-', 'Max_Vertical_Leap', 'Wingspan',
+    'Usage%', 'ORB%', 'DRB%', 'pAST%'
+]
+
+# Scraped from Basketball Reference as text; parsed to numbers when a store is built
+SCRAPED_COLUMNS = ['DBPM', 'DWS']
+
+# Every numeric column of a store, in matrix order
+STORE_COLUMNS = STAT_COLUMNS + SCRAPED_COLUMNS
+
+# Value type of the stat matrix; float32 halves the memory of large multi-season pools
+DEFAULT_DTYPE = np.float64
+
+# PLAYER_ID of rows whose ID is unknown (e.g. snapshots written before IDs were stored)
+UNKNOWN_PLAYER_ID = -1
+
+class PlayerStore:
+    """
+    Compact, typed table of player stats.
+
+    Holds one float matrix (players x STORE_COLUMNS) next to the player names and
+    IDs, instead of a dictionary of per-player dictionaries. The matrix is stored
+    column-major, so every stat column is a contiguous array, and to_frame wraps it
+    in a DataFrame without copying it.
+
+    Attributes:
+        names (np.ndarray): Player names, one per row.
+        player_ids (np.ndarray): NBA API PLAYER_IDs (int64), one per row.
+        values (np.ndarray): 2-D float array (players x columns).
+        columns (list): Column names of `values`.
+    """
+
+    def __init__(self, names, player_ids, values, columns=None):
+        self.names = np.asarray(names, dtype=object)
+        self.player_ids = np.asarray(player_ids, dtype=np.int64)
+        self.values = values
+        self.columns = list(STORE_COLUMNS if columns is None else columns)
+        self._column_index = {name: j for j, name in enumerate(self.columns)}
+        self._row_index = None
+
+    @classmethod
+    def from_frame(cls, df, dtype=DEFAULT_DTYPE):
+        """
+        Builds a store from a DataFrame with one row per player.
+
+        Every column in STORE_COLUMNS is parsed to a number (text that is not a
+        number becomes NaN); other columns are ignored. Missing schema columns are
+        reported and filled with 0.
+
+        Args:
+            df (pd.DataFrame): Player rows with a 'name' column (or index) and,
+                               optionally, a 'PLAYER_ID' column.
+            dtype (np.dtype): Value type of the matrix. Defaults to DEFAULT_DTYPE.
+
+        Returns:
+            PlayerStore: The store.
+        """
+        if 'name' not in df.columns:
+            df = df.rename_axis('name').reset_index()
+
+        missing = [column for column in STORE_COLUMNS if column not in df.columns]
+        if missing and len(df):
+            print(f"Warning: Player data is missing columns {missing}. Using 0.")
+
+        # Filled one column at a time into a column-major matrix
+        values = np.zeros((len(df), len(STORE_COLUMNS)), dtype=dtype, order='F')
+        for j, column in enumerate(STORE_COLUMNS):
+            if column in df.columns:
+                values[:, j] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+        if 'PLAYER_ID' in df.columns:
+            player_ids = pd.to_numeric(df['PLAYER_ID'], errors='coerce').fillna(UNKNOWN_PLAYER_ID).to_numpy(np.int64)
+        else:
+            player_ids = np.full(len(df), UNKNOWN_PLAYER_ID, dtype=np.int64)
+
+        return cls(df['name'].to_numpy(dtype=object), player_ids, values)
+
+    @classmethod
+    def from_records(cls, player_stats, dtype=DEFAULT_DTYPE):
+        """
+        Builds a store from the dictionary form {name: {stat: value}}.
+
+        Args:
+            player_stats (dict): A dictionary where keys are player names and values are dictionaries of stats.
+            dtype (np.dtype): Value type of the matrix. Defaults to DEFAULT_DTYPE.
+
+        Returns:
+            PlayerStore: The store.
+        """
+        df = pd.DataFrame(list(player_stats.values()))
+        df.insert(0, 'name', list(player_stats.keys()))
+        return cls.from_frame(df, dtype)
+
+    @classmethod
+    def concat(cls, stores):
+        """
+        Stacks several stores (e.g. one per season) into one, copying each matrix once.
+
+        Args:
+            stores (list): PlayerStore objects with the same columns.
+
+        Returns:
+            PlayerStore: The combined store.
+        """
+        return cls(
+            np.concatenate([store.names for store in stores]),
+            np.concatenate([store.player_ids for store in stores]),
+            np.asfortranarray(np.vstack([store.values for store in stores])),
+            stores[0].columns if stores else None
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows()
+
+    def _rows(self):
+        # Built on first lookup; a repeated name resolves to its last row
+        if self._row_index is None:
+            self._row_index = {name: i for i, name in enumerate(self.names)}
+        return self._row_index
+
+    def column(self, name):
+        """Returns a stat column as a view into the matrix (no copy)."""
+        return self.values[:, self._column_index[name]]
+
+    def rows_for_ids(self, player_ids):
+        """
+        Looks up rows by PLAYER_ID.
+
+        Args:
+            player_ids (array-like): PLAYER_IDs to look up.
+
+        Returns:
+            np.ndarray: Row of each PLAYER_ID, or -1 where the store has no such player.
+        """
+        ids = pd.Index(self.player_ids)
+        keep = ~ids.duplicated(keep='last')
+        rows = pd.Series(np.flatnonzero(keep), index=ids[keep])
+        return rows.reindex(player_ids, fill_value=-1).to_numpy()
+
+    def record(self, name):
+        """
+        Returns one player's stats in the dictionary form.
+
+        Args:
+            name (str): Player name.
+
+        Returns:
+            dict: PLAYER_ID followed by every stat column.
+        """
+        i = self._rows()[name]
+        record = {'PLAYER_ID': int(self.player_ids[i])}
+        record.update(zip(self.columns, self.values[i].tolist()))
+        return record
+
+    def to_records(self):
+        """
+        Converts the store to the dictionary form {name: {stat: value}}.
+
+        Returns:
+            dict: A dictionary where keys are player names and values are dictionaries of stats.
+        """
+        return {name: self.record(name) for name in self.names}
+
+    def to_frame(self):
+        """
+        Wraps the store in a DataFrame without copying the stat matrix.
+
+        The frame sees the matrix through a read-only view, so editing a stat cell in
+        place raises instead of writing into the store. Columns added to the frame
+        afterwards are its own.
+
+        Returns:
+            pd.DataFrame: One row per player with 'name', 'PLAYER_ID' and every stat column.
+        """
+        values = self.values.view()
+        values.flags.writeable = False
+        df = pd.DataFrame(values, columns=self.columns, copy=False)
+        df.insert(0, 'PLAYER_ID', self.player_ids)
+        df.insert(0, 'name', self.names)
+        return df
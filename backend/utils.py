@@ -15,27 +15,86 @@ def polynomial_return_to_scale(values, degree=1, normal_scaling=True):
     Returns:
         list: Scaled values between 0 and 100.
     """
-    output = []
-    old_min = min(values)
-    old_max = max(values)
+    column = np.asarray(values, dtype=np.float64).reshape(-1, 1)
+    return polynomial_return_to_scale_matrix(column, degree, normal_scaling)[:, 0].tolist()
+
+def polynomial_return_to_scale_matrix(values, degrees=1, normal_scaling=True, anchors=None):
+    """
+    Applies a polynomial function to every column of a 2-D objective matrix at once,
+    returning each column to a 0-100 scale.
+
+    Each column is scaled exactly like polynomial_return_to_scale would scale it on
+    its own: a column whose polynomial range is zero gets a scaling factor of 0.
+
+    Args:
+        values (np.ndarray): 2-D array (rows x columns) of values to be scaled.
+        degrees (int or array-like): Degree of the polynomial, either one for all
+                                     columns or one per column. Defaults to 1 (linear).
+        normal_scaling (bool or array-like): If True, performs normal scaling; if False,
+                                             performs reverse scaling. Either one for all
+                                             columns or one per column. Defaults to True.
+        anchors (tuple): Optional (low, high) arrays with one value per column, used in
+                         place of the column minimum and maximum (see
+                         value_functions.apply_value_functions). Defaults to the data range.
+
+    Returns:
+        np.ndarray: Scaled values between 0 and 100, same shape as `values`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        return values.copy()
+
+    n_columns = values.shape[1]
+    degrees = np.broadcast_to(np.asarray(degrees), (n_columns,))
+    normal_scaling = np.broadcast_to(np.asarray(normal_scaling, dtype=bool), (n_columns,))
+
+    low, high = (values.min(axis=0), values.max(axis=0)) if anchors is None else anchors
+    old_min = low ** degrees
+    old_max = high ** degrees
+    value_range = old_max - old_min
 
     # Handle division by zero
-    if old_max**degree - old_min**degree == 0:
-        print("Warning: Division by zero encountered in polynomial_return_to_scale. Setting scaling factor to 0.")
-        a = 0  # Set scaling factor to 0
-    else:
-        # Calculate polynomial coefficient
-        a = 100 / (old_max**degree - old_min**degree)
-
-    # Apply the polynomial function to the values
-    for v in values:
-        if normal_scaling:
-            # Normal scaling
-            new_v = a * (v**degree - old_min**degree)
-            output.append(new_v)
-        else:
-            # Reverse scaling
-            new_v = -a * (v**degree - old_max**degree)
-            output.append(new_v)
-
-    return output
\ No newline at end of file
+    degenerate = value_range == 0
+    for column in np.flatnonzero(degenerate):
+        print(f"Warning: Division by zero encountered in polynomial_return_to_scale (column {column}). Setting scaling factor to 0.")
+
+    # Calculate polynomial coefficients
+    a = np.zeros(n_columns)
+    np.divide(100, value_range, out=a, where=~degenerate)
+
+    # Normal scaling anchors at the minimum, reverse scaling at the maximum
+    powered = values ** degrees
+    return np.where(normal_scaling, a * (powered - old_min), -a * (powered - old_max))
+
+def top_k_order(scores, k):
+    """
+    Returns the indices of the k highest scores, highest first, without sorting every score.
+
+    Ties are broken by index and NaN scores come last, so the result always equals
+    the first k entries of a stable descending sort (np.argsort(-scores, kind='stable')).
+
+    Args:
+        scores (np.ndarray): 1-D array of scores.
+        k (int): Number of leaders to return.
+
+    Returns:
+        np.ndarray: Indices of the k leaders in ranking order.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    nan = np.isnan(scores)
+    if nan.any():
+        # A NaN threshold would select nothing; rank the other scores, then fill up with NaN in index order
+        valid = np.flatnonzero(~nan)
+        leaders = valid[top_k_order(scores[valid], k)]
+        return np.concatenate([leaders, np.flatnonzero(nan)[:k - len(leaders)]])
+
+    # O(n) selection of the k-th highest score; everything at or above it is a candidate
+    threshold = np.partition(scores, n - k)[n - k]
+    candidates = np.flatnonzero(scores >= threshold)
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return order[:k]
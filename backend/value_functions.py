@@ -0,0 +1,295 @@
+import numpy as np
+from .instrumentation import timed
+from .utils import polynomial_return_to_scale_matrix
+
+# --- Value Function Types ---
+# 'linear' and 'polynomial' work on the raw values, like polynomial_return_to_scale.
+# The other types work on the position between the anchors (0 at the anti-ideal, 1 at the ideal).
+FUNCTION_KINDS = ('linear', 'polynomial', 'exponential', 'piecewise_linear', 's_curve')
+
+# 'auto' infers the direction from the sign of the column mean, as the original return-to-scale did
+DIRECTIONS = ('increasing', 'decreasing', 'auto')
+
+# Value of the ideal anchor; the anti-ideal anchor is worth 0
+MAX_VALUE = 100
+
+# Fields of a value function's JSON form
+FIELDS = ('kind', 'direction', 'ideal', 'anti_ideal', 'degree', 'rate', 'breakpoints', 'midpoint', 'steepness')
+
+# --- Default Shape Parameters ---
+DEFAULT_DEGREE = 2
+DEFAULT_RATE = 3.0
+DEFAULT_MIDPOINT = 0.5
+DEFAULT_STEEPNESS = 10.0
+
+class ValueFunction:
+    """
+    Definition of one objective's value function.
+
+    Maps an objective's raw values onto a 0-100 scale: the anti-ideal anchor is
+    worth 0 and the ideal anchor is worth 100. Anchors that are not given are
+    taken from the data (the column minimum and maximum, depending on the
+    direction). Values beyond an explicitly given anchor are clamped to it.
+    Anchors that contradict an explicit direction (e.g. an 'increasing'
+    function whose ideal is below its anti-ideal) are rejected with ValueError.
+
+    Attributes:
+        kind (str): One of FUNCTION_KINDS.
+        direction (str): 'increasing' (higher is better), 'decreasing' or 'auto'.
+        ideal (float): Value worth 100, or None to take it from the data.
+        anti_ideal (float): Value worth 0, or None to take it from the data.
+        degree (int): Degree of a 'polynomial' function.
+        rate (float): Curvature of an 'exponential' function; positive rates give
+                      diminishing returns, negative rates increasing returns.
+        breakpoints (tuple): (position, value) pairs of a 'piecewise_linear' function,
+                             positions between 0 and 1, values between 0 and 100.
+        midpoint (float): Position (0 to 1) of the inflection of an 's_curve' function.
+        steepness (float): Slope of an 's_curve' function at its midpoint.
+    """
+
+    def __init__(self, kind='linear', direction='increasing', ideal=None, anti_ideal=None, degree=DEFAULT_DEGREE,
+                 rate=DEFAULT_RATE, breakpoints=None, midpoint=DEFAULT_MIDPOINT, steepness=DEFAULT_STEEPNESS):
+        if kind not in FUNCTION_KINDS:
+            raise ValueError(f"Unknown value function kind '{kind}'. Expected one of {list(FUNCTION_KINDS)}.")
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction '{direction}'. Expected one of {list(DIRECTIONS)}.")
+        if kind == 'polynomial' and (isinstance(degree, bool) or not isinstance(degree, int) or degree < 1):
+            raise ValueError("Degree must be a positive integer.")
+
+        # JSON parsers accept NaN and Infinity, so every number is checked
+        ideal = None if ideal is None else _finite('Ideal', ideal)
+        anti_ideal = None if anti_ideal is None else _finite('Anti-ideal', anti_ideal)
+        rate = _finite('Rate', rate)
+        midpoint = _finite('Midpoint', midpoint)
+        steepness = _finite('Steepness', steepness)
+
+        if ideal is not None and anti_ideal is not None and ideal == anti_ideal:
+            raise ValueError("The ideal and anti-ideal anchors must differ.")
+        if ideal is not None and anti_ideal is not None and direction != 'auto' and (ideal > anti_ideal) != (direction == 'increasing'):
+            raise ValueError(f"The anchors contradict the '{direction}' direction (ideal {ideal}, anti-ideal {anti_ideal}).")
+        if kind == 's_curve' and not steepness > 0:
+            # A flat curve would map every value to 0/0
+            raise ValueError("Steepness must be a positive number.")
+        if kind == 's_curve' and not 0 <= midpoint <= 1:
+            raise ValueError("Midpoint must be between 0 and 1.")
+
+        self.kind = kind
+        self.direction = direction
+        self.ideal = ideal
+        self.anti_ideal = anti_ideal
+        self.degree = 1 if kind == 'linear' else degree
+        self.rate = rate
+        self.breakpoints = _validate_breakpoints(breakpoints) if kind == 'piecewise_linear' else None
+        self.midpoint = midpoint
+        self.steepness = steepness
+
+    @classmethod
+    def from_dict(cls, definition):
+        """
+        Builds a value function from its JSON form, e.g. {"kind": "s_curve", "ideal": 8}.
+
+        Args:
+            definition (dict): Keyword arguments of ValueFunction.
+
+        Returns:
+            ValueFunction: The value function.
+
+        Raises:
+            ValueError: If the definition is not a dictionary or has unknown or invalid fields.
+        """
+        if not isinstance(definition, dict):
+            raise ValueError("A value function must be a JSON object.")
+        unknown = set(definition) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown value function fields: {sorted(unknown)}")
+        try:
+            return cls(**definition)
+        except TypeError as e:
+            raise ValueError(f"Invalid value function: {e}")
+
+    def to_dict(self):
+        """Returns the JSON form of the value function, with only the fields its kind uses."""
+        definition = {'kind': self.kind, 'direction': self.direction, 'ideal': self.ideal, 'anti_ideal': self.anti_ideal}
+        if self.kind == 'polynomial':
+            definition['degree'] = self.degree
+        elif self.kind == 'exponential':
+            definition['rate'] = self.rate
+        elif self.kind == 'piecewise_linear':
+            definition['breakpoints'] = [list(point) for point in self.breakpoints]
+        elif self.kind == 's_curve':
+            definition['midpoint'] = self.midpoint
+            definition['steepness'] = self.steepness
+        return definition
+
+    def ideal_value(self):
+        """Returns the scaled value of the ideal anchor: MAX_VALUE, or a piecewise-linear curve's value at position 1."""
+        if self.kind == 'piecewise_linear':
+            positions, values = zip(*self.breakpoints)
+            return float(np.interp(1.0, positions, values))
+        return float(MAX_VALUE)
+
+    def key(self):
+        """Returns a hashable key; two functions with the same key scale any column identically."""
+        definition = self.to_dict()
+        if 'breakpoints' in definition:
+            definition['breakpoints'] = self.breakpoints
+        return tuple(definition.items())
+
+    def __eq__(self, other):
+        return isinstance(other, ValueFunction) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"ValueFunction({fields})"
+
+def _finite(name, value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number.")
+    if not np.isfinite(value):
+        raise ValueError(f"{name} must be a finite number.")
+    return value
+
+def _validate_breakpoints(breakpoints):
+    if breakpoints is None:
+        return ((0.0, 0.0), (1.0, float(MAX_VALUE)))
+    try:
+        points = tuple((float(position), float(value)) for position, value in breakpoints)
+    except (TypeError, ValueError):
+        raise ValueError("Breakpoints must be a list of [position, value] pairs.")
+    if not np.isfinite(points).all():
+        raise ValueError("Breakpoints must be finite numbers.")
+    positions = [position for position, _ in points]
+    if len(points) < 2 or positions != sorted(positions) or len(set(positions)) != len(positions):
+        raise ValueError("Breakpoints need at least two points with strictly increasing positions.")
+    return points
+
+def polynomial(degree=DEFAULT_DEGREE, direction='increasing', ideal=None, anti_ideal=None):
+    """Shorthand for a 'polynomial' ValueFunction."""
+    return ValueFunction('polynomial', direction, ideal, anti_ideal, degree=degree)
+
+@timed('Return to scale')
+def apply_value_functions(values, functions, names=None):
+    """
+    Returns every column of a 2-D objective matrix to a 0-100 scale with its own value function.
+
+    Anchors and directions are resolved for all columns at once, and every column
+    is returned to scale between its anchors by polynomial_return_to_scale_matrix
+    (with degree 1 for the shaped kinds). Columns that share a shaped kind are
+    then evaluated together as one block, so re-scaling a matrix costs a handful
+    of array operations regardless of the definitions.
+
+    A column whose anchors coincide (e.g. a constant column) is scaled to 0. With
+    data anchors and 'auto' direction, a 'polynomial' function scales exactly like
+    polynomial_return_to_scale_matrix on its own.
+
+    Args:
+        values (np.ndarray): 2-D array (rows x columns) of values to be scaled, without NaN.
+        functions (list): One ValueFunction per column.
+        names (list): Optional column names, used in error messages.
+
+    Returns:
+        np.ndarray: Scaled values, same shape as `values`.
+
+    Raises:
+        ValueError: If an anchor taken from the data contradicts an explicit direction.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        return values.copy()
+    if len(functions) != values.shape[1]:
+        raise ValueError(f"Expected {values.shape[1]} value functions, got {len(functions)}.")
+
+    # --- Resolve directions and anchors ---
+    increasing = np.array([function.direction == 'increasing' for function in functions])
+    auto = np.array([function.direction == 'auto' for function in functions])
+    increasing[auto] = values[:, auto].mean(axis=0) >= 0
+
+    column_min = values.min(axis=0)
+    column_max = values.max(axis=0)
+    ideal = np.where(increasing, column_max, column_min)
+    anti_ideal = np.where(increasing, column_min, column_max)
+
+    clamped = []
+    for j, function in enumerate(functions):
+        if function.ideal is not None:
+            ideal[j] = function.ideal
+        if function.anti_ideal is not None:
+            anti_ideal[j] = function.anti_ideal
+        if function.ideal is not None or function.anti_ideal is not None:
+            clamped.append(j)
+
+    # An anchor taken from the data must not turn an explicit direction around
+    for j in clamped:
+        direction = functions[j].direction
+        if direction != 'auto' and ideal[j] != anti_ideal[j] and (ideal[j] > anti_ideal[j]) != (direction == 'increasing'):
+            raise ValueError(
+                f"The anchors of {names[j] if names is not None else f'column {j}'} contradict its '{direction}' direction "
+                f"(ideal {ideal[j]:g}, anti-ideal {anti_ideal[j]:g}; an anchor not given is taken from the data)."
+            )
+
+    if clamped:
+        values = values.copy()
+        low = np.minimum(ideal[clamped], anti_ideal[clamped])
+        high = np.maximum(ideal[clamped], anti_ideal[clamped])
+        values[:, clamped] = np.clip(values[:, clamped], low, high)
+
+    # --- Return to scale between the anchors ---
+    # Polynomial and linear columns are final here; the other kinds get their position
+    # between the anchors (degree 1) and are shaped below
+    kinds = np.array([function.kind for function in functions])
+    raw = np.isin(kinds, ('linear', 'polynomial'))
+    degrees = np.array([function.degree if is_raw else 1 for function, is_raw in zip(functions, raw)])
+    normal_scaling = ideal >= anti_ideal
+    anchors = (np.where(normal_scaling, anti_ideal, ideal), np.where(normal_scaling, ideal, anti_ideal))
+    scaled = polynomial_return_to_scale_matrix(values, degrees, normal_scaling, anchors)
+
+    # --- Evaluate each other kind on its block of columns ---
+    for kind in ('exponential', 'piecewise_linear', 's_curve'):
+        block = np.flatnonzero(kinds == kind)
+        if len(block):
+            position = scaled[:, block] / MAX_VALUE
+            scaled[:, block] = _SHAPES[kind](position, [functions[j] for j in block])
+
+    return scaled
+
+def _exponential(position, functions):
+    rate = np.array([function.rate for function in functions])
+    linear = rate == 0
+    # (1 - e^(-r*t)) / (1 - e^(-r)), which is exactly t when r is 0. A negative rate
+    # is the mirror image of the positive one, 1 - f(|r|, 1 - t), so e^(-r) never overflows.
+    mirrored = rate < 0
+    t = np.where(mirrored, 1 - position, position)
+    magnitude = np.abs(rate)
+    denominator = np.where(linear, 1.0, np.expm1(-magnitude))
+    curve = np.expm1(-magnitude * t) / denominator
+    curve = np.where(mirrored, 1 - curve, curve)
+    return MAX_VALUE * np.where(linear, position, curve)
+
+def _piecewise_linear(position, functions):
+    scaled = np.empty_like(position)
+    for j, function in enumerate(functions):
+        positions, values = zip(*function.breakpoints)
+        scaled[:, j] = np.interp(position[:, j], positions, values)
+    return scaled
+
+def _s_curve(position, functions):
+    midpoint = np.array([function.midpoint for function in functions])
+    steepness = np.array([function.steepness for function in functions])
+
+    def logistic(t):
+        return 1 / (1 + np.exp(-steepness * (t - midpoint)))
+
+    # Stretched so the anti-ideal is still worth 0 and the ideal 100
+    low, high = logistic(0.0), logistic(1.0)
+    return MAX_VALUE * (logistic(position) - low) / (high - low)
+
+_SHAPES = {
+    'exponential': _exponential,
+    'piecewise_linear': _piecewise_linear,
+    's_curve': _s_curve
+}
@@ -0,0 +1,232 @@
+"""
+Offline fixtures standing in for the NBA API endpoints and Basketball Reference pages.
+
+Fixtures are either recorded from the live services once (record_fixtures) or
+synthesized at any player count (synthetic_fixtures). installed_fixtures then
+points backend.data_fetcher at them, serving the Basketball Reference pages
+from a local HTTP server, so the whole pipeline runs without network access.
+"""
+import os
+import string
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import pandas as pd
+from backend import config, data_fetcher
+from backend.league import set_league_context
+from backend.player_index import PlayerIndex
+
+FIXTURE_SEASON = '2024-25'
+
+# League-wide frames a fixture set provides, keyed like data_fetcher.LEAGUE_ENDPOINTS
+FRAME_KEYS = ['general', 'per100', 'bio', 'clutch', 'combine', 'team']
+
+class FixtureEndpoint:
+    """Mimics an nba_api endpoint object returning a fixed frame."""
+
+    def __init__(self, df):
+        self._df = df
+
+    def get_data_frames(self):
+        return [self._df]
+
+def _letters(i, width=4):
+    """Encodes an integer as letters, so synthetic names survive name normalization."""
+    out = []
+    for _ in range(width):
+        i, r = divmod(i, 26)
+        out.append(string.ascii_lowercase[r])
+    return ''.join(reversed(out)).capitalize()
+
+def synthetic_fixtures(n_players, seed=0):
+    """
+    Synthesizes a fixture set with realistic column layouts and value ranges.
+
+    Every player qualifies on minutes, and every tenth player is left out of the
+    season-wide advanced table. Their Basketball Reference IDs are in 'slugs', as
+    if learned on an earlier run, so enrichment also scrapes individual player pages.
+
+    Args:
+        n_players (int): Number of players in the league-wide frames.
+        seed (int): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Frames keyed by FRAME_KEYS plus 'advanced_html' (the Basketball
+              Reference season-wide advanced table) and 'slugs' (PLAYER_ID -> Basketball
+              Reference ID of the players left out of the table).
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n_players + 1) * 7 + 1_000_000
+    names = [f"Synth {_letters(i)}" for i in range(n_players)]
+    gp = rng.integers(20, 83, n_players)
+
+    def totals(low, high):
+        return rng.uniform(low, high, n_players) * gp
+
+    general = pd.DataFrame({
+        'PLAYER_ID': ids, 'PLAYER_NAME': names, 'GP': gp,
+        'MIN': rng.uniform(data_fetcher.MIN_MINUTES, 38, n_players),
+        'PTS': totals(2, 33), 'AST': totals(0, 11), 'TOV': totals(0, 5),
+        'FG3A': totals(0, 10), 'FG3_PCT': rng.uniform(0, 0.45, n_players),
+        'FGM': totals(1, 12), 'FGA': totals(2, 22), 'FTA': totals(0, 10),
+        'FT_PCT': rng.uniform(0.5, 0.95, n_players), 'PLUS_MINUS': rng.uniform(-400, 400, n_players)
+    })
+    per100 = pd.DataFrame({'PLAYER_ID': ids, 'FG3A': rng.uniform(0, 15, n_players)})
+    bio = pd.DataFrame({
+        'PLAYER_ID': ids, 'PLAYER_HEIGHT_INCHES': rng.uniform(70, 88, n_players),
+        'PLAYER_WEIGHT': rng.uniform(170, 290, n_players), 'TS_PCT': rng.uniform(0.45, 0.68, n_players),
+        'USG_PCT': rng.uniform(0.1, 0.36, n_players), 'OREB_PCT': rng.uniform(0, 0.15, n_players),
+        'DREB_PCT': rng.uniform(0.05, 0.3, n_players), 'AST_PCT': rng.uniform(0.05, 0.5, n_players)
+    })
+    clutch = pd.DataFrame({
+        'PLAYER_ID': ids, 'PTS': rng.uniform(0, 150, n_players), 'FGA': rng.uniform(0, 100, n_players),
+        'FTA': rng.uniform(0, 40, n_players), 'PLUS_MINUS': rng.uniform(-40, 40, n_players)
+    })
+    combine_ids = ids[rng.random(n_players) < 0.4]
+    combine = pd.DataFrame({
+        'PLAYER_ID': combine_ids, 'MAX_VERTICAL_LEAP': rng.uniform(28, 42, len(combine_ids)),
+        'WINGSPAN': rng.uniform(75, 92, len(combine_ids))
+    })
+    team = pd.DataFrame({
+        'TEAM_ID': np.arange(30), 'EFG_PCT': rng.uniform(0.5, 0.58, 30),
+        'TS_PCT': rng.uniform(0.54, 0.6, 30), 'PACE': rng.uniform(96, 102, 30)
+    })
+
+    dws = rng.uniform(0, 6, n_players)
+    dbpm = rng.uniform(-3, 4, n_players)
+    rows = ''.join(
+        f'<tr><th data-stat="ranker">{i + 1}</th>'
+        f'<td data-stat="name_display"><a href="/players/s/synth{i:06d}.html">{name}</a></td>'
+        f'<td data-stat="dws">{dws[i]:.1f}</td><td data-stat="dbpm">{dbpm[i]:.1f}</td></tr>'
+        for i, name in enumerate(names) if i % 10
+    )
+    advanced_html = f'<html><body><table id="advanced"><tbody>{rows}</tbody></table></body></html>'
+
+    return {
+        'general': general, 'per100': per100, 'bio': bio, 'clutch': clutch,
+        'combine': combine, 'team': team, 'advanced_html': advanced_html,
+        'slugs': {int(ids[i]): f"synth{i:06d}" for i in range(0, n_players, 10)}
+    }
+
+def record_fixtures(directory, season=FIXTURE_SEASON):
+    """
+    Records a fixture set from the live services (requires network access).
+
+    Args:
+        directory (str): Directory to write the fixture files to.
+        season (str): The NBA season to record. Defaults to FIXTURE_SEASON.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    frames = data_fetcher.fetch_league_frames(season)
+    for key in FRAME_KEYS:
+        frames[key].to_parquet(os.path.join(directory, f"{key}.parquet"))
+
+    session = data_fetcher.create_session(pool_size=1)
+    url = f"{data_fetcher.BBREF_BASE_URL}/leagues/NBA_{data_fetcher.season_end_year(season)}_advanced.html"
+    response = data_fetcher.get_with_retry(session, url)
+    with open(os.path.join(directory, 'advanced.html'), 'wb') as f:
+        f.write(response.content)
+
+def load_recorded_fixtures(directory):
+    """
+    Loads a fixture set written by record_fixtures.
+
+    Args:
+        directory (str): Directory holding the fixture files.
+
+    Returns:
+        dict: Frames keyed by FRAME_KEYS plus 'advanced_html'.
+    """
+    fixtures = {key: pd.read_parquet(os.path.join(directory, f"{key}.parquet")) for key in FRAME_KEYS}
+    with open(os.path.join(directory, 'advanced.html'), 'rb') as f:
+        fixtures['advanced_html'] = f.read()
+    return fixtures
+
+def _page_server(fixtures):
+    """Starts a local HTTP server serving the fixture's Basketball Reference pages."""
+    advanced_html = fixtures['advanced_html']
+    if isinstance(advanced_html, str):
+        advanced_html = advanced_html.encode()
+
+    player_page = (
+        b'<table id="advanced"><thead><tr><th>Season</th><th>DWS</th><th>DBPM</th></tr></thead>'
+        b'<tbody><tr id="advanced.%d"><th>season</th><td>1.0</td><td>0.0</td></tr></tbody></table>'
+        % data_fetcher.season_end_year(FIXTURE_SEASON)
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = advanced_html if self.path.startswith('/leagues/') else player_page
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+@contextmanager
+def fresh_cache(fixtures):
+    """
+    Points the cache at a new temporary directory for the duration of the block.
+
+    The directory starts out holding only the fixture's player index, so frames,
+    checkpoints and slugs cached by an earlier run are never picked up.
+
+    Args:
+        fixtures (dict): Fixture set from synthetic_fixtures or load_recorded_fixtures.
+    """
+    saved_cache_dir = config.get_cache_dir()
+    cache_dir = tempfile.TemporaryDirectory()
+    try:
+        config.set_cache_dir(cache_dir.name)
+        if fixtures.get('slugs'):
+            index = PlayerIndex()
+            index.update_slugs(fixtures['slugs'])
+            index.save()
+        yield
+    finally:
+        config.set_cache_dir(saved_cache_dir)
+        cache_dir.cleanup()
+
+@contextmanager
+def installed_fixtures(fixtures):
+    """
+    Points backend.data_fetcher at a fixture set for the duration of the block.
+
+    NBA API endpoints are replaced by FixtureEndpoint objects, Basketball Reference
+    is served from a local HTTP server, the scrape rate limit is lifted, and the
+    cache lives in a temporary directory (see fresh_cache).
+
+    Args:
+        fixtures (dict): Fixture set from synthetic_fixtures or load_recorded_fixtures.
+    """
+    saved = {
+        'endpoints': dict(data_fetcher.LEAGUE_ENDPOINTS),
+        'base_url': data_fetcher.BBREF_BASE_URL,
+        'rate': data_fetcher.BBREF_REQUESTS_PER_MINUTE
+    }
+
+    server = _page_server(fixtures)
+    try:
+        for key in FRAME_KEYS:
+            data_fetcher.LEAGUE_ENDPOINTS[key] = lambda season, timeout, key=key: FixtureEndpoint(fixtures[key])
+        data_fetcher.BBREF_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+        data_fetcher.BBREF_REQUESTS_PER_MINUTE = 10 ** 9
+        set_league_context(FIXTURE_SEASON, data_fetcher.league_context_from_team_stats(fixtures['team']), persist=False)
+        with fresh_cache(fixtures):
+            yield
+    finally:
+        data_fetcher.LEAGUE_ENDPOINTS.clear()
+        data_fetcher.LEAGUE_ENDPOINTS.update(saved['endpoints'])
+        data_fetcher.BBREF_BASE_URL = saved['base_url']
+        data_fetcher.BBREF_REQUESTS_PER_MINUTE = saved['rate']
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,193 @@
+"""
+Times every stage of the data pipeline against offline fixtures and flags regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks                    # compare against baselines.json
+    python -m benchmarks.run_benchmarks --save-baseline    # record new baselines
+    python -m benchmarks.run_benchmarks --fixtures DIR     # use fixtures from record_fixtures
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext, redirect_stdout
+from backend.data_fetcher import fetch_player_table, enrich_players, assemble_player_stats
+from backend.moda import DEFAULT_WEIGHTS, ScoringDataset, calculate_advanced_stats, scale_objectives
+from .fixtures import FIXTURE_SEASON, synthetic_fixtures, load_recorded_fixtures, record_fixtures, installed_fixtures, fresh_cache
+
+# --- Benchmark Defaults ---
+DEFAULT_SIZES = [300, 1000, 10_000, 100_000]
+DEFAULT_REPEATS = 3
+
+# Per-player enrichment makes one request per player, so it is timed on at most this many
+MAX_ENRICH_PLAYERS = 1000
+
+# A stage regresses when it is slower than its baseline by more than this fraction
+DEFAULT_TOLERANCE = 0.25
+
+# Slowdowns smaller than this many seconds are timer noise, never regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+STAGES = ['bulk_fetch', 'enrichment', 'advanced_stats', 'return_to_scale', 'scoring']
+
+def _best_time(function, repeats, context=nullcontext):
+    """
+    Runs `function` `repeats` times and returns (best wall time in seconds, last result).
+
+    Every run happens inside a new `context()`, entered and left outside the timing.
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        with context():
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _quiet(function):
+    """Wraps `function` so the pipeline's progress prints don't flood the report."""
+    def run():
+        with redirect_stdout(io.StringIO()):
+            return function()
+    return run
+
+def benchmark_fixtures(fixtures, repeats=DEFAULT_REPEATS, season=FIXTURE_SEASON):
+    """
+    Times every pipeline stage on one fixture set.
+
+    Stages after enrichment run on every player; enrichment itself is timed on the
+    first MAX_ENRICH_PLAYERS players and the rest get their defensive stats straight
+    from the fixtures.
+
+    Args:
+        fixtures (dict): Fixture set from synthetic_fixtures or load_recorded_fixtures.
+        repeats (int): Runs per stage; the fastest is reported. Defaults to DEFAULT_REPEATS.
+        season (str): Season the fixtures stand in for. Defaults to FIXTURE_SEASON.
+
+    Returns:
+        dict: Best wall time in seconds per stage name in STAGES.
+    """
+    timings = {}
+
+    # Every run of a network stage starts from a cold cache, so later runs don't
+    # reuse the frames, checkpoint or slugs an earlier one left behind
+    cold = lambda: fresh_cache(fixtures)
+
+    with installed_fixtures(fixtures):
+        timings['bulk_fetch'], player_table = _best_time(_quiet(lambda: fetch_player_table(season)), repeats, cold)
+
+        enrich_table = player_table.head(MAX_ENRICH_PLAYERS)
+        timings['enrichment'], enriched = _best_time(_quiet(lambda: enrich_players(enrich_table, season)), repeats, cold)
+
+    for player_id, name in player_table['PLAYER_NAME'].items():
+        enriched.setdefault(player_id, {'name': name, 'DBPM': '0.0', 'DWS': '0.0'})
+    player_stats = assemble_player_stats(player_table, enriched)
+
+    timings['advanced_stats'], df = _best_time(_quiet(lambda: calculate_advanced_stats(player_stats, season)), repeats)
+    timings['return_to_scale'], (objectives, scaled, ideal) = _best_time(lambda: scale_objectives(df), repeats)
+
+    dataset = ScoringDataset(df['name'].to_numpy(), objectives, scaled, ideal, stats=df)
+    timings['scoring'], _ = _best_time(lambda: dataset.rank(DEFAULT_WEIGHTS), repeats)
+
+    return timings
+
+def run_benchmarks(sizes=None, repeats=DEFAULT_REPEATS, fixtures_dir=None):
+    """
+    Benchmarks the pipeline on synthetic fixtures of several sizes, or on recorded fixtures.
+
+    Args:
+        sizes (list): Synthetic player counts. Defaults to DEFAULT_SIZES.
+        repeats (int): Runs per stage. Defaults to DEFAULT_REPEATS.
+        fixtures_dir (str): Directory of recorded fixtures; if given, only they are benchmarked.
+
+    Returns:
+        dict: Stage timings keyed by fixture label ('recorded' or the player count as a string).
+    """
+    if fixtures_dir is not None:
+        return {'recorded': benchmark_fixtures(load_recorded_fixtures(fixtures_dir), repeats)}
+
+    results = {}
+    for n_players in sizes or DEFAULT_SIZES:
+        results[str(n_players)] = benchmark_fixtures(synthetic_fixtures(n_players), repeats)
+    return results
+
+def find_regressions(results, baselines, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares benchmark results against stored baselines.
+
+    Args:
+        results (dict): Output of run_benchmarks.
+        baselines (dict): Previously saved output of run_benchmarks.
+        tolerance (float): Allowed slowdown as a fraction of the baseline. Defaults to DEFAULT_TOLERANCE.
+
+    Returns:
+        list: (label, stage, baseline seconds, current seconds) for every regressed stage.
+    """
+    regressions = []
+    for label, timings in results.items():
+        for stage, seconds in timings.items():
+            baseline = baselines.get(label, {}).get(stage)
+            if baseline is None or seconds - baseline < MIN_REGRESSION_SECONDS:
+                continue
+            if seconds > baseline * (1 + tolerance):
+                regressions.append((label, stage, baseline, seconds))
+    return regressions
+
+def print_report(results, baselines):
+    """Prints one line per fixture and stage with the time and the change against the baseline."""
+    print(f"{'players':>10} {'stage':<16} {'seconds':>10} {'baseline':>10} {'change':>8}")
+    for label, timings in results.items():
+        for stage in STAGES:
+            seconds = timings[stage]
+            baseline = baselines.get(label, {}).get(stage)
+            if baseline:
+                print(f"{label:>10} {stage:<16} {seconds:10.4f} {baseline:10.4f} {seconds / baseline - 1:+8.0%}")
+            else:
+                print(f"{label:>10} {stage:<16} {seconds:10.4f} {'-':>10} {'-':>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NBA_MODA pipeline against offline fixtures.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Synthetic player counts.")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Runs per stage; the fastest counts.")
+    parser.add_argument('--fixtures', help="Directory of recorded fixtures to benchmark instead of synthetic ones.")
+    parser.add_argument('--record', metavar='DIR', help="Record fixtures from the live services into DIR and exit.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline file to compare against or save to.")
+    parser.add_argument('--save-baseline', action='store_true', help="Save the results as the new baseline.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown before failing.")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.record)
+        print(f"Fixtures recorded to {args.record}")
+        return 0
+
+    results = run_benchmarks(args.sizes, args.repeats, args.fixtures)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    print_report(results, baselines)
+
+    if args.save_baseline:
+        baselines.update({
+            label: {stage: round(seconds, 6) for stage, seconds in timings.items()} for label, timings in results.items()
+        })
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.tolerance)
+    for label, stage, baseline, seconds in regressions:
+        print(f"Regression: {stage} with {label} players took {seconds:.4f}s (baseline {baseline:.4f}s)")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
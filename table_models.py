@@ -0,0 +1,108 @@
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class ArrayTableModel(QAbstractTableModel):
+    """
+    Read-only table model over a set of equally long column arrays.
+
+    Cells are read straight from the NumPy buffers when the view asks for them,
+    so only the visible rows are ever formatted. Sorting reorders a row index
+    rather than the data, and replacing the values of a same-shaped table
+    updates the view in place instead of resetting it.
+    """
+
+    def __init__(self, decimals=None, parent=None):
+        super().__init__(parent)
+        # Number of decimals shown per column; floats in other columns are shown as is
+        self.decimals = decimals or {}
+        self._headers = []
+        self._columns = []
+        self._order = np.arange(0)
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._columns[index.column()][self._order[index.row()]]
+            decimals = self.decimals.get(self._headers[index.column()])
+            if decimals is not None and isinstance(value, (float, np.floating)):
+                return str(round(float(value), decimals))
+            return str(value)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if self._columns[index.column()].dtype.kind in 'iuf':
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
+
+    def set_columns(self, columns):
+        """
+        Replaces the table contents.
+
+        Args:
+            columns (dict): Column name -> 1-D array, all of the same length.
+        """
+        headers = list(columns)
+        arrays = [np.asarray(values) for values in columns.values()]
+        n_rows = len(arrays[0]) if arrays else 0
+
+        if headers == self._headers and n_rows == len(self._order):
+            # Same shape: swap the buffers and refresh the cells in place
+            self._columns = arrays
+            self._apply_sort()
+            if n_rows and headers:
+                self.dataChanged.emit(self.index(0, 0), self.index(n_rows - 1, len(headers) - 1))
+            return
+
+        self.beginResetModel()
+        self._headers = headers
+        self._columns = arrays
+        self._order = np.arange(n_rows)
+        if self._sort_column is not None and self._sort_column >= len(headers):
+            self._sort_column = None
+        self._apply_sort(emit=False)
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._apply_sort()
+
+    def _apply_sort(self, emit=True):
+        if self._sort_column is None or not self._columns:
+            return
+
+        if emit:
+            self.layoutAboutToBeChanged.emit()
+            # Remember which underlying row each persistent index (e.g. the selection) points at
+            persistent = self.persistentIndexList()
+            source_rows = [self._order[index.row()] for index in persistent]
+
+        order = np.argsort(self._columns[self._sort_column], kind='stable')
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1]
+        self._order = order
+
+        if emit:
+            positions = np.empty_like(order)
+            positions[order] = np.arange(len(order))
+            self.changePersistentIndexList(
+                persistent, [self.index(int(positions[row]), index.column()) for row, index in zip(source_rows, persistent)]
+            )
+            self.layoutChanged.emit()
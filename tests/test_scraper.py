@@ -0,0 +1,99 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from backend import scraper
+
+@pytest.fixture
+def flaky_server():
+    """
+    Starts a local HTTP server that rate limits the first `failures` requests for every path.
+
+    Yields:
+        tuple: (base_url, hits, failures), where hits counts the requests per path and
+               failures may be changed before the first request.
+    """
+    hits = Counter()
+    failures = {'count': 1}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with lock:
+                hits[self.path] += 1
+                rate_limited = hits[self.path] <= failures['count']
+
+            body = b'slow down' if rate_limited else self.path.encode()
+            self.send_response(429 if rate_limited else 200)
+            if rate_limited:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}', hits, failures
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_get_with_retry_retries_after_429(flaky_server):
+    base_url, hits, _ = flaky_server
+    with scraper.create_session() as session:
+        response = scraper.get_with_retry(session, base_url + '/player', backoff=0)
+
+    assert response.status_code == 200
+    assert response.text == '/player'
+    assert hits['/player'] == 2
+
+def test_get_with_retry_returns_last_response_when_retries_run_out(flaky_server):
+    base_url, hits, failures = flaky_server
+    failures['count'] = 10
+    with scraper.create_session() as session:
+        response = scraper.get_with_retry(session, base_url + '/player', max_retries=2, backoff=0)
+
+    assert response.status_code == 429
+    assert hits['/player'] == 3
+
+def test_get_with_retry_takes_a_token_per_attempt(flaky_server):
+    base_url, _, _ = flaky_server
+
+    class CountingLimiter:
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+
+    limiter = CountingLimiter()
+    with scraper.create_session() as session:
+        scraper.get_with_retry(session, base_url + '/player', rate_limiter=limiter, backoff=0)
+
+    assert limiter.acquired == 2
+
+def test_scrape_concurrently_collects_results_and_errors(flaky_server):
+    base_url, hits, _ = flaky_server
+    paths = [f'/player/{i}' for i in range(8)]
+    finished = []
+
+    with scraper.create_session() as session:
+        def scrape(path):
+            if path == paths[-1]:
+                raise ValueError('unparseable page')
+            response = scraper.get_with_retry(session, base_url + path, backoff=0)
+            response.raise_for_status()
+            return response.text
+
+        results, errors = scraper.scrape_concurrently(
+            paths, scrape, on_result=lambda item, result, error: finished.append(item)
+        )
+
+    assert results == {path: path for path in paths[:-1]}
+    assert list(errors) == [paths[-1]]
+    assert isinstance(errors[paths[-1]], ValueError)
+    assert sorted(finished) == sorted(paths)
+    assert all(hits[path] == 2 for path in paths[:-1])